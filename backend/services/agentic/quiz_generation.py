@@ -5,13 +5,20 @@ Removes redundant code while preserving working functionality
 
 import json
 import asyncio
+import functools
+import itertools
 import os
+import re
 import boto3
 import time
 import random
+import sys
 import threading
+from collections import OrderedDict, defaultdict
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple, TypedDict
 from dataclasses import dataclass
 from strands import Agent, tool
 from strands_tools import http_request
@@ -23,35 +30,274 @@ from botocore.exceptions import NoCredentialsError, PartialCredentialsError, Cli
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Interval timing (rate limiting, backoff, circuit breaker) uses a clock that NTP adjustments can't move
+_monotonic = time.monotonic
+
+# Seconds a quiz may spend waiting on Bedrock before the remaining questions use fallback templates
+_QUIZ_TIME_BUDGET = 90.0
+
+# Part of that budget syllabus retrieval may use, so question generation always gets the rest
+_SYLLABUS_TIME_BUDGET = 20.0
+
+# Precompiled patterns for parse_structured_question (tried in order, first match wins)
+_QUESTION_PATTERNS = tuple(re.compile(p, re.DOTALL | re.IGNORECASE) for p in [
+    r'\*\*Question:\*\*\s*(.*?)(?=\*\*|$)',
+    r'Question:\s*(.*?)(?=\n\n|Options:|A\)|Correct|$)',
+    r'^(.*?)(?=\n\n|Options:|A\)|Correct|$)'
+])
+
+# Where the options block sits in a free-form MCQ reply (tried in order, first match wins)
+_OPTION_PATTERNS = tuple(re.compile(p, re.DOTALL | re.IGNORECASE) for p in [
+    r'(?:\*\*Options:\*\*|Options:)\s*(.*?)(?=\*\*Correct|\*\*Answer|Correct Answer|$)',
+    r'((?:A\)|a\)|\d\)).*?)(?=\*\*Correct|\*\*Answer|Correct Answer|$)',
+    r'((?:[A-D]\).*?\n)+)'
+])
+
+# One option per line within that block, e.g. "A) 5 m/s", "b. 10 N" or "1) x = 2"; the prefix is dropped by the group
+_MCQ_LINE_RE = re.compile(r'^\s*(?:[A-Da-d]|\d+)\s*[\)\.]\s*(?P<text>.+?)\s*$', re.MULTILINE)
+
+_ANSWER_PATTERNS = tuple(re.compile(p, re.DOTALL | re.IGNORECASE) for p in [
+    r'\*\*Correct Answer:\*\*\s*(.*?)(?=\*\*|$)',
+    r'\*\*Answer:\*\*\s*(.*?)(?=\*\*|$)',
+    r'Correct Answer:\s*(.*?)(?=\n\n|Explanation|$)',
+    r'Answer:\s*(.*?)(?=\n\n|Explanation|$)'
+])
+
+_EXPLANATION_PATTERNS = tuple(re.compile(p, re.DOTALL | re.IGNORECASE) for p in [
+    r'\*\*Explanation:\*\*\s*(.*?)$',
+    r'\*\*Solution:\*\*\s*(.*?)$',
+    r'Explanation:\s*(.*?)$'
+])
+
+_ANSWER_PREFIX_RE = re.compile(r'^[A-Za-z]\)\s*|^\d+\)\s*')
+
+# Whole-response patterns for the exact layouts _MCQ_PROMPT and _STRUCTURED_PROMPT request
+_MCQ_RE = re.compile(
+    r'\*\*Question:\*\*\s*(?P<question>.*?)\s*\*\*Options:\*\*\s*(?P<options>.*?)\s*'
+    r'\*\*Correct Answer:\*\*\s*(?P<answer>.*?)\s*\*\*Explanation:\*\*\s*(?P<explanation>.*)',
+    re.DOTALL
+)
+_STRUCT_RE = re.compile(
+    r'\*\*Question:\*\*\s*(?P<question>.*?)\s*'
+    r'\*\*Correct Answer:\*\*\s*(?P<answer>.*?)\s*\*\*Explanation:\*\*\s*(?P<explanation>.*)',
+    re.DOTALL
+)
+_CANONICAL_RE_BY_TYPE = {'mcq': _MCQ_RE, 'structured': _STRUCT_RE}
+
+# Outermost {...} span, for JSON replies wrapped in prose or code fences
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Question generation prompts; {difficulty}, {topic} and {subject} come from the question metadata
+_MCQ_PROMPT = """
+Generate a {difficulty} difficulty multiple choice question for '{topic}' ({subject}).
+
+REQUIREMENTS:
+- Singapore O-Level standard
+- Question must be different from previous questions
+- Include variety in scenarios and values
+
+FORMAT (use exactly this structure):
+**Question:** [Clear, concise question text]
+
+**Options:**
+A) [Option 1]
+B) [Option 2]
+C) [Option 3]
+D) [Option 4]
+
+**Correct Answer:** [Exact option text from above]
+
+**Explanation:** [Brief explanation of why this answer is correct]
+"""
+
+_STRUCTURED_PROMPT = """
+Generate a {difficulty} difficulty structured question for '{topic}' ({subject}).
+
+REQUIREMENTS:
+- Singapore O-Level standard
+- Question must be different from previous questions
+- Should require detailed working/explanation
+
+FORMAT (use exactly this structure):
+**Question:** [Clear question requiring detailed answer]
+
+**Correct Answer:** [Complete model answer with working]
+
+**Explanation:** [Brief explanation of the approach/method]
+"""
+
+_PROMPT_BY_TYPE = {'mcq': _MCQ_PROMPT, 'structured': _STRUCTURED_PROMPT}
+
+# Appended when several questions share a prompt, so one call returns them all
+_VARIANTS_INSTRUCTIONS = """
+Generate {count} distinct questions, each in the format above, with different scenarios and values.
+Separate consecutive questions with a line containing only ---
+"""
+
+_VARIANT_SEPARATOR_RE = re.compile(r'^\s*-{3,}\s*$', re.MULTILINE)
+
+_SYLLABUS_CODE_TO_SUBJECT = {
+    '6091': 'Physics',
+    '4048': 'Elementary Mathematics',
+    '1128': 'English Language'
+}
+
+# Static syllabus summaries served by the fetch_syllabus_content tool ({topic} is filled per call)
+_SYLLABUS_TEMPLATES = {
+    '6091': """
+Singapore GCE O-Level Physics Syllabus 6091 - {topic}
+
+Key Learning Objectives:
+- Understand motion concepts including displacement, velocity, acceleration
+- Apply kinematic equations for uniformly accelerated motion
+- Analyze motion graphs (displacement-time, velocity-time)
+- Calculate using equations of motion: v = u + at, s = ut + ½at², v² = u² + 2as
+
+Assessment Standards:
+- Apply mathematical skills in physics contexts
+- Interpret and analyze experimental data
+- Solve problems involving motion in one dimension
+""",
+    '4048': """
+Singapore GCE O-Level Elementary Mathematics Syllabus 4048 - {topic}
+
+Key Learning Objectives:
+- Solve linear equations in one variable
+- Solve quadratic equations using factorization, completing the square, quadratic formula
+- Form and solve equations from word problems
+- Graph linear and quadratic functions
+
+Assessment Standards:
+- Demonstrate algebraic manipulation skills
+- Apply problem-solving strategies
+- Use mathematical reasoning and communication
+""",
+}
+_DEFAULT_SYLLABUS_TEMPLATE = "General syllabus content for {topic} - Singapore O-Level standards"
+
+@functools.lru_cache(maxsize=256)
+def _render_syllabus_content(syllabus_code: str, topic: str) -> str:
+    """Render the static syllabus summary for a topic (memoized per syllabus code and topic)"""
+    return _SYLLABUS_TEMPLATES.get(syllabus_code, _DEFAULT_SYLLABUS_TEMPLATE).format(topic=topic)
+
+# (epoch second, ISO string) for the most recent fallback timestamp; replaced as a whole so threads never see a torn pair
+_iso_timestamp_cache = (0, "")
+
+def _iso_now_cached() -> str:
+    """Current local time as an ISO string to the second, formatted at most once per second"""
+    global _iso_timestamp_cache
+    second = int(time.time())
+    cached_second, cached_iso = _iso_timestamp_cache
+    if cached_second != second:
+        cached_iso = datetime.fromtimestamp(second).isoformat()
+        _iso_timestamp_cache = (second, cached_iso)
+    return cached_iso
+
+# Bedrock / AWS error codes that mean "slow down" rather than "this request is broken"
+THROTTLE_CODES = frozenset({
+    'ThrottlingException', 'Throttling', 'TooManyRequestsException',
+    'ProvisionedThroughputExceededException', 'RequestLimitExceeded',
+    'ModelThrottledException'
+})
+
+# Last resort for errors that wrap the botocore error without keeping its response
+_THROTTLE_RE = re.compile(r'throttl|too many requests|rate limit', re.IGNORECASE)
+
+def _is_throttling(error: Exception) -> bool:
+    """Check whether an error is a throttling error, preferring the AWS error code"""
+    if isinstance(error, ClientError):
+        return error.response.get('Error', {}).get('Code') in THROTTLE_CODES
+    # Strands surfaces Bedrock throttling as its own ModelThrottledException
+    if type(error).__name__ in THROTTLE_CODES:
+        return True
+    return bool(_THROTTLE_RE.search(str(error)))
+
+# Matches server hints such as "Please try again in 12 seconds" or "retry after 500ms"
+_RETRY_HINT_RE = re.compile(
+    r'(?:try again|retry)\s+(?:in|after)\s+(\d+(?:\.\d+)?)\s*(ms|milliseconds?|s\b|secs?\b|seconds?)?',
+    re.IGNORECASE
+)
+
+def _server_retry_hint(error: Exception) -> Optional[float]:
+    """Return the wait (in seconds) suggested by the server for a throttled request, if any"""
+    response = getattr(error, 'response', None)
+    message = str(error)
+    
+    if isinstance(response, dict):
+        headers = response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+        retry_after = headers.get('retry-after')
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass  # HTTP-date form - fall through to the message check
+        
+        error_info = response.get('Error', {})
+        if 'retryDelayInMs' in error_info:
+            try:
+                return float(error_info['retryDelayInMs']) / 1000
+            except (TypeError, ValueError):
+                pass
+        message = error_info.get('Message') or message
+    
+    match = _RETRY_HINT_RE.search(message)
+    if not match:
+        return None
+    
+    delay = float(match.group(1))
+    unit = (match.group(2) or 's').lower()
+    return delay / 1000 if unit.startswith('m') else delay
+
 class ExponentialBackoffHandler:
     """Enhanced exponential backoff specifically for AWS Bedrock throttling"""
     
     def __init__(self, max_retries=8, base_delay=2.0):
         self.max_retries = max_retries
         self.base_delay = base_delay
+        self.min_gap = 1.0  # Minimum 1 second between request starts
         self.request_times = []
+        self._lock = threading.Lock()
+    
+    def reserve_request_slot(self) -> float:
+        """Reserve the next request start time and return how long to wait until it"""
+        with self._lock:
+            # Clean old request timestamps (older than 1 minute)
+            current_time = _monotonic()
+            self.request_times = [t for t in self.request_times if current_time - t < 60]
+            
+            # Concurrent callers each get their own slot, at least min_gap apart
+            start_time = current_time
+            if self.request_times:
+                start_time = max(current_time, max(self.request_times) + self.min_gap)
+            self.request_times.append(start_time)
+            return start_time - current_time
     
     def execute_with_backoff(self, func, *args, **kwargs):
-        """Execute function with exponential backoff on throttling"""
+        """Execute a blocking function with exponential backoff on throttling.
+        
+        Only for synchronous callers: it drives the shared async retry loop on its own
+        event loop, so calling it from async code fails loudly instead of stalling the loop.
+        Async callers should await execute_with_backoff_async instead.
+        """
+        async def invoke():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+        
+        return asyncio.run(self.execute_with_backoff_async(invoke))
+    
+    async def execute_with_backoff_async(self, invoke: Callable[[], Awaitable[Any]]):
+        """Await invoke() with exponential backoff on throttling"""
         
         for attempt in range(self.max_retries):
             try:
-                # Clean old request timestamps (older than 1 minute)
-                current_time = time.time()
-                self.request_times = [t for t in self.request_times if current_time - t < 60]
+                # Ensure minimum gap between requests (slots are reserved, so concurrent calls stay spaced)
+                sleep_time = self.reserve_request_slot()
+                if sleep_time > 0:
+                    logger.info("🛡️ Enforcing %.1fs gap between requests", sleep_time)
+                    await asyncio.sleep(sleep_time)
                 
-                # Ensure minimum gap between requests
-                if self.request_times:
-                    time_since_last = current_time - max(self.request_times)
-                    min_gap = 1.0  # Minimum 1 second between any requests
-                    if time_since_last < min_gap:
-                        sleep_time = min_gap - time_since_last
-                        logger.info(f"🛡️ Enforcing {sleep_time:.1f}s gap between requests")
-                        time.sleep(sleep_time)
-                
-                # Execute the function
-                result = func(*args, **kwargs)
-                self.request_times.append(time.time())
+                # Execute the call
+                result = await invoke()
                 
                 # Success - reset any circuit breakers
                 logger.info("✅ Request succeeded with exponential backoff")
@@ -61,34 +307,44 @@ class ExponentialBackoffHandler:
                 error_msg = str(e)
                 
                 # Check if this is a throttling error
-                is_throttling = any(phrase in error_msg.lower() for phrase in [
-                    'throttling', 'too many requests', 'rate limit', 
-                    'modelthrottledexception', 'throttledexception'
-                ])
+                is_throttling = _is_throttling(e)
                 
                 if is_throttling and attempt < self.max_retries - 1:
-                    # Calculate exponential backoff with jitter
-                    backoff_time = (self.base_delay * (2 ** attempt)) + random.uniform(0, 2)
+                    # Calculate exponential backoff with jitter (or the server's retry hint)
+                    backoff_time = self.get_backoff_time(attempt, e)
                     
-                    logger.warning(f"🔄 AWS throttling detected. Attempt {attempt + 1}/{self.max_retries}")
-                    logger.warning(f"⏱️ Exponential backoff: waiting {backoff_time:.1f}s before retry")
+                    logger.warning("🔄 AWS throttling detected. Attempt %d/%d", attempt + 1, self.max_retries)
+                    logger.warning("⏱️ Exponential backoff: waiting %.1fs before retry", backoff_time)
                     
-                    time.sleep(backoff_time)
+                    await asyncio.sleep(backoff_time)
                     continue
                 else:
                     # Non-throttling error or max retries exceeded
                     if is_throttling:
-                        logger.error(f"❌ Max throttling retries ({self.max_retries}) exceeded")
+                        logger.error("❌ Max throttling retries (%d) exceeded", self.max_retries)
                     else:
-                        logger.error(f"❌ Non-throttling error: {error_msg}")
+                        logger.error("❌ Non-throttling error: %s", error_msg)
                     raise e
         
         # Should not reach here
         raise Exception("Exponential backoff failed unexpectedly")
+    
+    def get_backoff_time(self, attempt: int, error: Exception) -> float:
+        """Backoff before the next retry, honouring any server-provided retry hint"""
+        # Exponential backoff with jitter
+        backoff_time = (self.base_delay * (2 ** attempt)) + random.uniform(0, 2)
+        
+        server_hint = _server_retry_hint(error)
+        if server_hint is not None and server_hint > backoff_time:
+            logger.warning("⏱️ Backoff source: server-hint (%.1fs, client computed %.1fs)", server_hint, backoff_time)
+            return server_hint
+        
+        logger.warning("⏱️ Backoff source: client-computed (%.1fs)", backoff_time)
+        return backoff_time
 
 # Removed unused timeout wrapper - no longer needed with improved architecture
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Subject:
     name: str
     syllabus: str
@@ -96,8 +352,8 @@ class Subject:
     topics: List[str]
     description: str
 
-@dataclass
-class Question:
+class Question(TypedDict):
+    """A quiz question as returned in the quiz payload"""
     id: str
     topic: str
     subject: str
@@ -108,6 +364,27 @@ class Question:
     correct_answer: str
     explanation: str
 
+class QuestionMeta(NamedTuple):
+    """What to generate for one quiz question"""
+    topic: str
+    difficulty: str
+    type: str
+    index: int
+    subject: str
+
+@dataclass(slots=True)
+class _ParsedResult:
+    """AI (or cached) question text that has already been through the parser"""
+    parsed: Dict[str, Any]
+
+@dataclass(slots=True)
+class _FallbackResult:
+    """Template question used in place of an AI response; already structured, so it skips the parser"""
+    template: Mapping[str, Any]
+
+class _BudgetSpent(Exception):
+    """The quiz time budget ran out before a Bedrock call could be sent"""
+
 class AWSRequestQueue:
     """Single-threaded request queue to prevent AWS throttling by ensuring only one request at a time"""
     
@@ -116,11 +393,10 @@ class AWSRequestQueue:
         self.is_processing = False
         self.failure_count = 0
         self.success_count = 0
-        self.last_request_time = 0
-        self.min_request_gap = 5.0  # Minimum 5 seconds between requests to avoid throttling
         self.is_circuit_open = False
         self.circuit_open_time = 0
         self.circuit_timeout = 60  # 1 minute circuit breaker timeout for throttling recovery
+        self.half_open_probe = False  # True while a single probe request is in flight
         self._lock = threading.Lock()
     
     def record_failure(self):
@@ -128,11 +404,16 @@ class AWSRequestQueue:
         with self._lock:
             self.failure_count += 1
             
+            if self.half_open_probe:
+                # Probe failed - keep the circuit open for another full cooldown
+                self.half_open_probe = False
+                self.circuit_open_time = _monotonic()
+                logger.warning("🔴 Half-open probe failed - cooling down for another %ss", self.circuit_timeout)
             # Open circuit breaker after 2 consecutive failures for faster fallback
-            if self.failure_count >= 2 and not self.is_circuit_open:
+            elif self.failure_count >= 2 and not self.is_circuit_open:
                 self.is_circuit_open = True
-                self.circuit_open_time = time.time()
-                logger.warning(f"🔴 Circuit breaker opened - cooling down for {self.circuit_timeout}s")
+                self.circuit_open_time = _monotonic()
+                logger.warning("🔴 Circuit breaker opened - cooling down for %ss", self.circuit_timeout)
     
     def record_success(self):
         """Record an API success"""
@@ -140,48 +421,240 @@ class AWSRequestQueue:
             self.success_count += 1
             self.failure_count = max(0, self.failure_count - 1)
             
-            # Close circuit breaker on success
+            # Close circuit breaker on success (normally the half-open probe)
             if self.is_circuit_open:
                 self.is_circuit_open = False
-                logger.info(f"🟢 Circuit breaker closed - requests resumed")
+                self.half_open_probe = False
+                self.failure_count = 0
+                logger.info("🟢 Circuit breaker closed - requests resumed")
+    
+    def cancel_attempt(self):
+        """Give back a half-open probe that was claimed but whose outcome says nothing about the API"""
+        with self._lock:
+            self.half_open_probe = False
+    
+    def is_cooling_down(self) -> bool:
+        """True while the circuit is open and not yet ready for a probe (does not claim the probe)"""
+        with self._lock:
+            return self.is_circuit_open and (
+                self.half_open_probe or _monotonic() - self.circuit_open_time <= self.circuit_timeout
+            )
     
     def should_attempt_call(self) -> bool:
         """Check if we should attempt an AI call"""
-        if not self.is_circuit_open:
-            return True
-        
-        # Check if circuit breaker timeout has passed
-        if time.time() - self.circuit_open_time > self.circuit_timeout:
-            self.is_circuit_open = False
-            logger.info(f"🟢 Circuit breaker auto-closed after {self.circuit_timeout}s")
+        with self._lock:
+            if not self.is_circuit_open:
+                return True
+            
+            # After the cooldown, admit exactly one probe; everyone else keeps using fallbacks
+            if self.half_open_probe or _monotonic() - self.circuit_open_time <= self.circuit_timeout:
+                return False
+            
+            self.half_open_probe = True
+            logger.info("🟡 Circuit breaker half-open after %ss - sending a single probe request", self.circuit_timeout)
             return True
-        
-        return False
+
+class TokenBucket:
+    """Client-side token bucket pacing Bedrock calls, with AIMD rate control on throttling"""
     
-    async def get_request_delay(self) -> float:
-        """Get proper delay to prevent throttling - conservative approach for 100% success rate"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_request_gap:
-            delay = self.min_request_gap - time_since_last
-            logger.info(f"⏱️ Anti-throttling delay: waiting {delay:.1f}s for 100% agentic RAG success")
-            return delay
-        
-        # Shorter delay for better user experience
-        logger.info(f"⏱️ Standard anti-throttling delay: {self.min_request_gap}s")
-        return self.min_request_gap
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate  # Tokens (requests) added per second
+        self.base_rate = rate
+        self.min_rate = rate / 8
+        self.capacity = capacity
+        self.tokens = capacity  # Start full so the first requests of a quiz go out immediately
+        self.updated = _monotonic()
+        self.success_streak = 0
+        self.recovery_streak = 3  # Consecutive successes needed before each rate increase
+        # Thread lock rather than asyncio.Lock: the agent is shared by quiz threads that
+        # each run their own event loop, and the critical section never awaits
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take one token (possibly going into debt) and return how long to wait for it"""
+        with self._lock:
+            now = _monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+    
+    async def acquire(self):
+        """Wait until a request token is available"""
+        delay = self._reserve()
+        if delay > 0:
+            logger.info("⏱️ Rate limiter: waiting %.1fs for a request token", delay)
+            await asyncio.sleep(delay)
+    
+    def on_throttle(self):
+        """Multiplicative decrease after a throttling response"""
+        with self._lock:
+            self.success_streak = 0
+            self.rate = max(self.min_rate, self.rate / 2)
+            logger.info("💡 Rate limiter slowed to %.3f req/s after throttling", self.rate)
+    
+    def on_success(self):
+        """Additive increase back toward the configured rate after a sustained success streak"""
+        with self._lock:
+            if self.rate >= self.base_rate:
+                return
+            self.success_streak += 1
+            if self.success_streak >= self.recovery_streak:
+                self.success_streak = 0
+                self.rate = min(self.base_rate, self.rate + self.base_rate / 10)
+                logger.info("💡 Rate limiter recovered to %.3f req/s", self.rate)
+
+class QuestionCache:
+    """Bounded LRU of generated question text with a TTL, holding several variants per question slot.
+    
+    A slot is (topic, difficulty, type, index). Successive quizzes rotate through a slot's
+    variants, so a repeat quiz on the same topics only reuses a question every `variants` runs.
+    """
+    
+    def __init__(self, maxsize: int = 500, ttl: float = 7 * 24 * 3600, variants: int = 3):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.variants = variants
+        self._entries = OrderedDict()  # (*slot, variant) -> (stored_at, question_text)
+        self._next_variant = OrderedDict()  # slot -> variant the next quiz uses
+        self._lock = threading.Lock()
+    
+    def next_key(self, slot: Tuple[str, str, str, int]) -> Tuple[str, str, str, int, int]:
+        """Cache key for the slot's next variant, advancing the slot's rotation"""
+        with self._lock:
+            variant = self._next_variant.pop(slot, 0)
+            self._next_variant[slot] = (variant + 1) % self.variants
+            if len(self._next_variant) > self.maxsize:
+                self._next_variant.popitem(last=False)
+            return (*slot, variant)
+    
+    def get(self, key: Tuple[str, str, str, int, int]) -> Optional[str]:
+        """Return the cached question text, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, question_text = entry
+            if _monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return question_text
+    
+    def put(self, key: Tuple[str, str, str, int, int], question_text: str):
+        """Store question text, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (_monotonic(), question_text)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+# Process-wide, so repeat quizzes on the same topics reuse earlier variants even across agent instances
+_question_cache = QuestionCache()
+
+# Shared boto3 session; the STS client is created on first use so importing never touches AWS config
+_boto_session = boto3.Session()
+_sts_client = None
+
+def _get_sts_client():
+    """Return the process-wide STS client, creating it on first use"""
+    global _sts_client
+    if _sts_client is None:
+        _sts_client = _boto_session.client('sts')
+    return _sts_client
+
+@functools.lru_cache(maxsize=1)
+def _validate_aws_credentials():
+    """Validate AWS credentials are properly configured (once per process; failures are not cached)"""
+    try:
+        # Use the shared STS client to verify credentials
+        identity = _get_sts_client().get_caller_identity()
+
+        logger.info(f"✅ AWS credentials validated for account: {identity.get('Account', 'Unknown')}")
+        logger.info(f"✅ AWS identity ARN: {identity.get('Arn', 'Unknown')}")
+
+    except (NoCredentialsError, PartialCredentialsError) as e:
+        logger.error(f"❌ AWS credentials not found or incomplete: {e}")
+        logger.error("Please ensure AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY are set")
+        raise RuntimeError("AWS credentials validation failed - Strands SDK requires valid AWS credentials")
+
+    except ClientError as e:
+        error_code = e.response['Error']['Code']
+        if error_code in ['InvalidUserID.NotFound', 'AccessDenied']:
+            logger.error(f"❌ AWS credentials are invalid or lack permissions: {e}")
+            raise RuntimeError("AWS credentials validation failed - Invalid or insufficient permissions")
+        else:
+            logger.error(f"❌ AWS credential validation failed: {e}")
+            raise RuntimeError(f"AWS credentials validation failed: {error_code}")
+
+    except Exception as e:
+        logger.error(f"❌ Unexpected error validating AWS credentials: {e}")
+        raise RuntimeError(f"AWS credentials validation failed: {str(e)}")
+
+# Fallback question templates, keyed by subject name then topic (frozen once indexed below).
+# Kept as data next to this module so the literal isn't compiled into the module's bytecode.
+_FALLBACK_TEMPLATES: Dict[str, Dict[str, Sequence[Mapping[str, Any]]]] = json.loads(
+    Path(__file__).with_name('fallback_templates.json').read_text(encoding='utf-8')
+)
+
+# (topic, difficulty) -> templates of that difficulty, for rotating through fallback questions
+_FALLBACK_BY_TOPIC_DIFF: Dict[Tuple[str, str], List[Mapping[str, Any]]] = {}
+# topic -> ready-made quiz questions (all but the id), for serving a whole fallback quiz
+_FALLBACK_QUESTIONS_BY_TOPIC: Dict[str, Tuple[Mapping[str, Any], ...]] = {}
+for _subject_name, _topic_templates in _FALLBACK_TEMPLATES.items():
+    for _topic, _templates in _topic_templates.items():
+        # Every quiz shares these templates (and their options), so freeze them against mutation.
+        # JSON gives each difficulty/type value its own string object; intern them so comparisons
+        # and hashing against the literals used elsewhere hit the identity fast path.
+        _frozen_templates = []
+        for _template in _templates:
+            _template = {
+                **_template,
+                'difficulty': sys.intern(_template['difficulty']),
+                'type': sys.intern(_template['type'])
+            }
+            if 'options' in _template:
+                _template['options'] = tuple(_template['options'])
+            _frozen_templates.append(MappingProxyType(_template))
+        _templates = tuple(_frozen_templates)
+        _topic_templates[_topic] = _templates
+        _base_questions = []
+        for _template in _templates:
+            _base_question = {
+                'topic': _topic,
+                'subject': _subject_name,
+                'difficulty': _template['difficulty'],
+                'type': _template['type'],
+                'question': _template['question']
+            }
+            # Structured questions omit 'options' rather than sending null; the client defaults it
+            if 'options' in _template:
+                _base_question['options'] = _template['options']
+            _base_question['correct_answer'] = _template['correct_answer']
+            _base_question['explanation'] = f"This is a fallback {_template['difficulty']} question covering {_topic} from Singapore O-Level {_subject_name}."
+            _base_questions.append(MappingProxyType(_base_question))
+        _FALLBACK_QUESTIONS_BY_TOPIC[_topic] = tuple(_base_questions)
+        for _template in _templates:
+            _FALLBACK_BY_TOPIC_DIFF.setdefault((_topic, _template['difficulty']), []).append(_template)
+
+# Ids for a whole-quiz fallback: every topic's questions at most once each, so this covers any deduplicated quiz
+_FALLBACK_IDS = tuple(
+    f'fallback_{n}' for n in range(1, sum(map(len, _FALLBACK_QUESTIONS_BY_TOPIC.values())) + 1)
+)
 
 class EvaluationQuizAgent:
     def __init__(self):
         # Initialize AWS request queue for single-threaded processing
         self.request_queue = AWSRequestQueue()
         
+        # Token bucket sized to the Bedrock request budget (1 request / 5s sustained, bursts of 3)
+        self.bucket = TokenBucket(rate=1 / 5.0, capacity=3)
+        
         # Initialize exponential backoff handler for AWS throttling
         self.backoff_handler = ExponentialBackoffHandler(max_retries=8, base_delay=2.0)
         
-        # Validate AWS credentials first
-        self._validate_aws_credentials()
+        # Validate AWS credentials first (the STS round-trip only happens for the first agent)
+        _validate_aws_credentials()
         
         # Singapore official sources
         self.sources = {
@@ -216,36 +689,22 @@ class EvaluationQuizAgent:
             )
         ]
         
-        # Initialize agents
-        self.setup_agents()
-    
-    def _validate_aws_credentials(self):
-        """Validate AWS credentials are properly configured"""
-        try:
-            # Create STS client to verify credentials
-            sts_client = boto3.client('sts')
-            identity = sts_client.get_caller_identity()
-            
-            logger.info(f"✅ AWS credentials validated for account: {identity.get('Account', 'Unknown')}")
-            logger.info(f"✅ AWS identity ARN: {identity.get('Arn', 'Unknown')}")
-            
-        except (NoCredentialsError, PartialCredentialsError) as e:
-            logger.error(f"❌ AWS credentials not found or incomplete: {e}")
-            logger.error("Please ensure AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY are set")
-            raise RuntimeError("AWS credentials validation failed - Strands SDK requires valid AWS credentials")
+        # Topic -> subject index so lookups don't rescan every subject's topic list
+        self._topic_to_subject = {topic: subject for subject in self.subjects for topic in subject.topics}
         
-        except ClientError as e:
-            error_code = e.response['Error']['Code']
-            if error_code in ['InvalidUserID.NotFound', 'AccessDenied']:
-                logger.error(f"❌ AWS credentials are invalid or lack permissions: {e}")
-                raise RuntimeError("AWS credentials validation failed - Invalid or insufficient permissions")
-            else:
-                logger.error(f"❌ AWS credential validation failed: {e}")
-                raise RuntimeError(f"AWS credentials validation failed: {error_code}")
+        # Agents are built lazily by _ensure_rag_agent() on the first quiz, so constructing
+        # this class (e.g. just for template fallbacks) never blocks on Strands/Bedrock setup
+        self.rag_agent = None
+        self.rag_tools = None
+        self.agent_tools = None
+        self.model_id = "us.anthropic.claude-sonnet-4-20250514-v1:0"
         
-        except Exception as e:
-            logger.error(f"❌ Unexpected error validating AWS credentials: {e}")
-            raise RuntimeError(f"AWS credentials validation failed: {str(e)}")
+        # Idle question agents for reuse; quiz requests run on separate threads, so guard with a lock
+        self._idle_question_agents = []
+        self._question_agent_lock = threading.Lock()
+        
+        # Per topic/difficulty rotation through fallback templates
+        self._fallback_counters: Dict[str, int] = defaultdict(int)
     
     def setup_agents(self):
         """Setup agents with immediate fallback for reliability"""
@@ -259,6 +718,7 @@ class EvaluationQuizAgent:
             logger.warning(f"⚠️ Agent setup failed, using lazy initialization: {e}")
             # Use lazy initialization as fallback
             self.rag_agent = None
+            self.rag_tools = None
             self.agent_tools = None
             self.model_id = "us.anthropic.claude-sonnet-4-20250514-v1:0"
             logger.info("✅ Agent setup configured for lazy initialization")
@@ -270,50 +730,11 @@ class EvaluationQuizAgent:
         def fetch_syllabus_content(syllabus_code: str, topic: str) -> str:
             """Fetch detailed syllabus content for Singapore O-Level subjects"""
             try:
-                subject_map = {
-                    '6091': 'Physics',
-                    '4048': 'Elementary Mathematics', 
-                    '1128': 'English Language'
-                }
-                
-                subject_name = subject_map.get(syllabus_code, 'Unknown')
+                subject_name = _SYLLABUS_CODE_TO_SUBJECT.get(syllabus_code, 'Unknown')
                 logger.info(f"🔍 Retrieving syllabus content for {topic} from {subject_name} ({syllabus_code})")
                 
                 # Return structured syllabus content based on syllabus code
-                if syllabus_code == '6091':  # Physics
-                    return f"""
-                    Singapore GCE O-Level Physics Syllabus 6091 - {topic}
-                    
-                    Key Learning Objectives:
-                    - Understand motion concepts including displacement, velocity, acceleration
-                    - Apply kinematic equations for uniformly accelerated motion
-                    - Analyze motion graphs (displacement-time, velocity-time)
-                    - Calculate using equations of motion: v = u + at, s = ut + ½at², v² = u² + 2as
-                    
-                    Assessment Standards:
-                    - Apply mathematical skills in physics contexts
-                    - Interpret and analyze experimental data
-                    - Solve problems involving motion in one dimension
-                    """
-                
-                elif syllabus_code == '4048':  # Mathematics
-                    return f"""
-                    Singapore GCE O-Level Elementary Mathematics Syllabus 4048 - {topic}
-                    
-                    Key Learning Objectives:
-                    - Solve linear equations in one variable
-                    - Solve quadratic equations using factorization, completing the square, quadratic formula
-                    - Form and solve equations from word problems
-                    - Graph linear and quadratic functions
-                    
-                    Assessment Standards:
-                    - Demonstrate algebraic manipulation skills
-                    - Apply problem-solving strategies
-                    - Use mathematical reasoning and communication
-                    """
-                
-                else:
-                    return f"General syllabus content for {topic} - Singapore O-Level standards"
+                return _render_syllabus_content(syllabus_code, topic)
                 
             except Exception as e:
                 logger.error(f"Error fetching syllabus content: {e}")
@@ -364,8 +785,9 @@ class EvaluationQuizAgent:
             return question_data
         
         # Main RAG Agent
+        self.rag_tools = [http_request, fetch_syllabus_content, generate_adaptive_questions]
         self.rag_agent = Agent(
-            tools=[http_request, fetch_syllabus_content, generate_adaptive_questions],
+            tools=self.rag_tools,
             model="us.anthropic.claude-sonnet-4-20250514-v1:0"  # Using Claude Sonnet 4 with cross-region inference
         )
 
@@ -383,105 +805,63 @@ class EvaluationQuizAgent:
             # Return None to trigger fallback
             return None
     
+    def _acquire_question_agent(self):
+        """Take an idle question agent from the pool, or create a fresh one if none is free"""
+        with self._question_agent_lock:
+            if self._idle_question_agents:
+                return self._idle_question_agents.pop()
+        return self._create_fresh_question_agent()
+    
+    def _release_question_agent(self, agent):
+        """Return a healthy question agent to the pool with its conversation cleared"""
+        agent.messages.clear()  # each question starts from an empty conversation
+        with self._question_agent_lock:
+            self._idle_question_agents.append(agent)
+    
+    def _create_rag_agent(self):
+        """Create a RAG agent so concurrent syllabus lookups don't share conversation state"""
+        return Agent(tools=self.rag_tools, model=self.model_id)
+    
     async def _invoke_agent_with_backoff(self, agent, query):
         """Async wrapper for agent invocation with exponential backoff"""
-        
-        # Create an async version of the exponential backoff logic
-        for attempt in range(self.backoff_handler.max_retries):
-            try:
-                # Clean old request timestamps (older than 1 minute)
-                current_time = time.time()
-                self.backoff_handler.request_times = [
-                    t for t in self.backoff_handler.request_times if current_time - t < 60
-                ]
-                
-                # Ensure minimum gap between requests
-                if self.backoff_handler.request_times:
-                    time_since_last = current_time - max(self.backoff_handler.request_times)
-                    min_gap = 1.0  # Minimum 1 second between any requests
-                    if time_since_last < min_gap:
-                        sleep_time = min_gap - time_since_last
-                        logger.info(f"🛡️ Enforcing {sleep_time:.1f}s gap between requests")
-                        await asyncio.sleep(sleep_time)
-                
-                # Execute the agent call
-                result = await agent.invoke_async(query)
-                self.backoff_handler.request_times.append(time.time())
-                
-                # Success - reset any circuit breakers
-                logger.info("✅ Request succeeded with exponential backoff")
-                return result
-                
-            except Exception as e:
-                error_msg = str(e)
-                
-                # Check if this is a throttling error
-                is_throttling = any(phrase in error_msg.lower() for phrase in [
-                    'throttling', 'too many requests', 'rate limit', 
-                    'modelthrottledexception', 'throttledexception'
-                ])
-                
-                if is_throttling and attempt < self.backoff_handler.max_retries - 1:
-                    # Calculate exponential backoff with jitter
-                    backoff_time = (self.backoff_handler.base_delay * (2 ** attempt)) + random.uniform(0, 2)
-                    
-                    logger.warning(f"🔄 AWS throttling detected. Attempt {attempt + 1}/{self.backoff_handler.max_retries}")
-                    logger.warning(f"⏱️ Exponential backoff: waiting {backoff_time:.1f}s before retry")
-                    
-                    await asyncio.sleep(backoff_time)
-                    continue
-                else:
-                    # Non-throttling error or max retries exceeded
-                    if is_throttling:
-                        logger.error(f"❌ Max throttling retries ({self.backoff_handler.max_retries}) exceeded")
-                    else:
-                        logger.error(f"❌ Non-throttling error: {error_msg}")
-                    raise e
-        
-        # Should not reach here
-        raise Exception("Exponential backoff failed unexpectedly")
+        return await self.backoff_handler.execute_with_backoff_async(lambda: agent.invoke_async(query))
     
     def get_selected_syllabi(self, selected_topics: List[str]) -> List[str]:
         """Get syllabus codes for selected topics"""
-        syllabi = []
-        for topic in selected_topics:
-            for subject in self.subjects:
-                if topic in subject.topics:
-                    syllabi.append(subject.syllabus)
-        return list(set(syllabi))  # Remove duplicates
+        return list({
+            self._topic_to_subject[topic].syllabus
+            for topic in selected_topics
+            if topic in self._topic_to_subject
+        })  # Remove duplicates
     
     def get_subject_by_topic(self, topic: str) -> Optional[Subject]:
         """Get subject object for a given topic"""
-        for subject in self.subjects:
-            if topic in subject.topics:
-                return subject
-        return None
+        return self._topic_to_subject.get(topic)
     
     def extract_question_content(self, ai_response) -> str:
         """Extract raw question content from AI response object"""
         try:
             # Handle Strands AI response format
-            if hasattr(ai_response, 'message'):
-                message_str = str(ai_response.message)
-                # Parse if it's a dict/JSON structure
-                if message_str.startswith("{'role'"):
-                    import ast
-                    parsed = ast.literal_eval(message_str)
-                    if 'content' in parsed and isinstance(parsed['content'], list):
-                        return parsed['content'][0]['text']
-                return message_str
-            elif hasattr(ai_response, 'content'):
+            message = getattr(ai_response, 'message', None)
+            if isinstance(message, str):
+                return message
+            if isinstance(message, dict):
+                # Strands messages look like {'role': ..., 'content': [{'text': ...}, ...]}
+                content = message.get('content')
+                if isinstance(content, list) and content and isinstance(content[0], dict):
+                    return content[0].get('text', '')
+                return str(content)
+            if message is not None:
+                return str(message)
+            if hasattr(ai_response, 'content'):
                 return str(ai_response.content)
-            else:
-                return str(ai_response)
+            return str(ai_response)
         except Exception as e:
             logger.warning(f"Failed to extract question content: {e}")
             return str(ai_response)[:200]  # Fallback to truncated string
 
     def parse_structured_question(self, ai_response_text: str, question_type: str) -> Dict[str, Any]:
         """Parse AI-generated question into structured components"""
-        import re
-        
         # Initialize result structure
         parsed = {
             'question': '',
@@ -493,85 +873,66 @@ class EvaluationQuizAgent:
         try:
             text = ai_response_text.strip()
             
-            # Extract question text
-            question_patterns = [
-                r'\*\*Question:\*\*\s*(.*?)(?=\*\*|$)',
-                r'Question:\s*(.*?)(?=\n\n|Options:|A\)|Correct|$)',
-                r'^(.*?)(?=\n\n|Options:|A\)|Correct|$)'
-            ]
-            
-            for pattern in question_patterns:
-                match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-                if match:
-                    parsed['question'] = match.group(1).strip()
-                    break
+            answer = None
             
-            if question_type == 'mcq':
-                # Extract MCQ options
-                option_patterns = [
-                    r'(?:\*\*Options:\*\*|Options:)\s*(.*?)(?=\*\*Correct|\*\*Answer|Correct Answer|$)',
-                    r'((?:A\)|a\)|\d\)).*?)(?=\*\*Correct|\*\*Answer|Correct Answer|$)',
-                    r'((?:[A-D]\).*?\n)+)'
-                ]
+            # Fast path: the exact layout our prompts request, captured with one match
+            match = _CANONICAL_RE_BY_TYPE[question_type].search(text) if question_type in _CANONICAL_RE_BY_TYPE else None
+            if match:
+                parsed['question'] = match.group('question').strip()
+                answer = match.group('answer').strip()
+                parsed['explanation'] = match.group('explanation').strip()
+                options_text = match.group('options') if question_type == 'mcq' else None
+            else:
+                # Extract question text
+                for pattern in _QUESTION_PATTERNS:
+                    match = pattern.search(text)
+                    if match:
+                        parsed['question'] = match.group(1).strip()
+                        break
                 
-                for pattern in option_patterns:
-                    match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+                # Extract correct answer
+                for pattern in _ANSWER_PATTERNS:
+                    match = pattern.search(text)
                     if match:
-                        options_text = match.group(1).strip()
-                        # Parse individual options
-                        option_lines = [line.strip() for line in options_text.split('\n') if line.strip()]
-                        parsed['options'] = []
-                        
-                        for line in option_lines:
-                            # Remove option prefixes (A), B), 1), etc.)
-                            cleaned = re.sub(r'^[A-Za-z]\)\s*|^\d+\)\s*|^[A-Za-z]\.\s*|^\d+\.\s*', '', line).strip()
-                            if cleaned:
-                                parsed['options'].append(cleaned)
-                        
-                        if len(parsed['options']) < 2:  # Fallback if parsing failed
-                            parsed['options'] = None
+                        answer = match.group(1).strip()
                         break
+                
+                # Extract explanation
+                for pattern in _EXPLANATION_PATTERNS:
+                    match = pattern.search(text)
+                    if match:
+                        parsed['explanation'] = match.group(1).strip()
+                        break
+                
+                # Only the options block is scanned, so numbered lines in the stem or explanation aren't options
+                options_text = None
+                if question_type == 'mcq':
+                    for pattern in _OPTION_PATTERNS:
+                        match = pattern.search(text)
+                        if match:
+                            options_text = match.group(1)
+                            break
             
-            # Extract correct answer
-            answer_patterns = [
-                r'\*\*Correct Answer:\*\*\s*(.*?)(?=\*\*|$)',
-                r'\*\*Answer:\*\*\s*(.*?)(?=\*\*|$)', 
-                r'Correct Answer:\s*(.*?)(?=\n\n|Explanation|$)',
-                r'Answer:\s*(.*?)(?=\n\n|Explanation|$)'
-            ]
-            
-            for pattern in answer_patterns:
-                match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-                if match:
-                    answer = match.group(1).strip()
-                    
-                    # For MCQ, extract just the option text without prefix
-                    if question_type == 'mcq' and parsed['options']:
-                        # Handle "A) option text" or "option text" formats
-                        clean_answer = re.sub(r'^[A-Za-z]\)\s*|^\d+\)\s*', '', answer).strip()
-                        # Find matching option
-                        for option in parsed['options']:
-                            if clean_answer.lower() in option.lower() or option.lower() in clean_answer.lower():
-                                parsed['correct_answer'] = option
-                                break
-                        if not parsed['correct_answer']:  # Fallback
-                            parsed['correct_answer'] = clean_answer
-                    else:
-                        parsed['correct_answer'] = answer
-                    break
-            
-            # Extract explanation
-            explanation_patterns = [
-                r'\*\*Explanation:\*\*\s*(.*?)$',
-                r'\*\*Solution:\*\*\s*(.*?)$',
-                r'Explanation:\s*(.*?)$'
-            ]
+            if question_type == 'mcq' and options_text is not None:
+                # Extract MCQ options in a single pass over the options block
+                parsed['options'] = [m.group('text') for m in _MCQ_LINE_RE.finditer(options_text)][:4]
+                if len(parsed['options']) < 2:  # Fallback if parsing failed
+                    parsed['options'] = None
             
-            for pattern in explanation_patterns:
-                match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-                if match:
-                    parsed['explanation'] = match.group(1).strip()
-                    break
+            if answer is not None:
+                # For MCQ, extract just the option text without prefix
+                if question_type == 'mcq' and parsed['options']:
+                    # Handle "A) option text" or "option text" formats
+                    clean_answer = _ANSWER_PREFIX_RE.sub('', answer).strip()
+                    # Find matching option
+                    for option in parsed['options']:
+                        if clean_answer.lower() in option.lower() or option.lower() in clean_answer.lower():
+                            parsed['correct_answer'] = option
+                            break
+                    if not parsed['correct_answer']:  # Fallback
+                        parsed['correct_answer'] = clean_answer
+                else:
+                    parsed['correct_answer'] = answer
             
             # Validation and fallbacks
             if not parsed['question']:
@@ -584,11 +945,13 @@ class EvaluationQuizAgent:
             if not parsed['explanation']:
                 parsed['explanation'] = f'This question tests understanding of the given topic.'
             
-            logger.info(f"✅ Parsed structured question: {len(parsed['question'])} chars, {len(parsed['options']) if parsed['options'] else 0} options")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("✅ Parsed structured question: %d chars, %d options",
+                            len(parsed['question']), len(parsed['options']) if parsed['options'] else 0)
             return parsed
             
         except Exception as e:
-            logger.error(f"❌ Failed to parse structured question: {e}")
+            logger.error("❌ Failed to parse structured question: %s", e)
             # Return basic fallback structure
             return {
                 'question': ai_response_text[:500] if len(ai_response_text) > 500 else ai_response_text,
@@ -611,11 +974,69 @@ class EvaluationQuizAgent:
                 raise e
         return self.rag_agent
 
+    async def _fetch_batch_syllabus(self, syllabus_topics: List[tuple], deadline: float) -> Dict[str, str]:
+        """Retrieve syllabus content for every topic with one Bedrock request, finishing by deadline.
+        
+        Returns only the topics the response covered; an empty dict means the batch failed.
+        """
+        if not syllabus_topics:
+            return {}
+        
+        topic_lines = "\n".join(
+            f"- {topic} (Singapore O-Level {subject.name} syllabus {subject.syllabus})"
+            for topic, subject in syllabus_topics
+        )
+        content_query = f"""Retrieve detailed syllabus content for each of these topics:
+{topic_lines}
+
+Return ONLY a JSON object whose keys are exactly these topic names: {json.dumps([topic for topic, _ in syllabus_topics])}
+and whose values are the syllabus content for that topic as a string."""
+        
+        try:
+            result = await asyncio.wait_for(
+                self._invoke_agent_with_backoff(self._create_rag_agent(), content_query),
+                timeout=max(0.0, min(60.0, deadline - _monotonic()))  # Allow time for backoff retries, within the given budget
+            )
+        except asyncio.TimeoutError:
+            logger.warning("⏱️ Timeout retrieving batched syllabus content (including retries)")
+            return {}
+        except Exception as e:
+            logger.error(f"❌ Failed to retrieve batched syllabus content after exponential backoff: {e}")
+            return {}
+        
+        response_text = self.extract_question_content(result)
+        try:
+            parsed = json.loads(response_text)
+        except ValueError:
+            # Models often wrap the JSON in prose or a code fence
+            match = _JSON_OBJECT_RE.search(response_text)
+            try:
+                parsed = json.loads(match.group(0)) if match else None
+            except ValueError:
+                parsed = None
+        
+        if not isinstance(parsed, dict):
+            logger.warning("⚠️ Batched syllabus response was not a JSON object")
+            return {}
+        
+        syllabus_content = {
+            topic: str(parsed[topic])
+            for topic, _ in syllabus_topics
+            if parsed.get(topic)
+        }
+        logger.info(f"✅ Retrieved syllabus content for {len(syllabus_content)}/{len(syllabus_topics)} topics in one request")
+        return syllabus_content
+    
     async def start_quiz_async(self, selected_topics: List[str]) -> Dict[str, Any]:
         """Main async method to start quiz with agentic RAG integration and EXTREME delays"""
         if not selected_topics:
             raise ValueError("No topics selected")
         
+        # Bound total Bedrock wait; anything still outstanding at the deadline uses fallback templates
+        started = _monotonic()
+        deadline = started + _QUIZ_TIME_BUDGET
+        syllabus_deadline = started + _SYLLABUS_TIME_BUDGET
+        
         try:
             # Ensure RAG agent is available
             self._ensure_rag_agent()
@@ -625,31 +1046,6 @@ class EvaluationQuizAgent:
             logger.info(f"Starting quiz for topics: {selected_topics}")
             logger.info(f"Using syllabi: {selected_syllabi}")
             
-            # Step 1: Retrieve syllabus content using RAG agent with timeout
-            syllabus_content = {}
-            for topic in selected_topics:
-                subject = self.get_subject_by_topic(topic)
-                if subject:
-                    content_query = f"Retrieve detailed syllabus content for {topic} from Singapore O-Level {subject.name} syllabus {subject.syllabus}"
-                    
-                    try:
-                        # Use exponential backoff handler for AWS Bedrock throttling
-                        result = await asyncio.wait_for(
-                            self._invoke_agent_with_backoff(self.rag_agent, content_query),
-                            timeout=60.0  # Increased timeout to allow for backoff retries
-                        )
-                        syllabus_content[topic] = result.message
-                        logger.info(f"✅ Retrieved syllabus content for {topic} with exponential backoff")
-                    except asyncio.TimeoutError:
-                        logger.warning(f"⏱️ Timeout retrieving syllabus for {topic} (including retries), using fallback content")
-                        syllabus_content[topic] = f"Fallback content for {topic}"
-                    except Exception as e:
-                        logger.error(f"❌ Failed to retrieve syllabus for {topic} after exponential backoff: {e}")
-                        syllabus_content[topic] = f"Fallback content for {topic}"
-            
-            # Step 2: Generate questions with EXTREME delays (sequential processing)
-            generated_questions = []
-            
             # Define difficulty progression: 3 batches of 3 questions (9 total)
             difficulty_config = [
                 {'level': 'easy', 'count': 3, 'type': 'mcq'},          # Batch 1: Concept Identification
@@ -657,230 +1053,260 @@ class EvaluationQuizAgent:
                 {'level': 'hard', 'count': 3, 'type': 'structured'},   # Batch 3: Multi-Step Application
             ]
             
-            # Collect question metadata for sequential processing
-            question_metadata = []
+            # Collect question metadata up front so a cooling-down circuit can skip Bedrock entirely
+            question_metadata: List[QuestionMeta] = []
             
             for topic in selected_topics:
+                subject = self.get_subject_by_topic(topic)
+                subject_name = subject.name if subject else 'General'
                 for diff_config in difficulty_config:
                     for i in range(diff_config['count']):
-                        subject = self.get_subject_by_topic(topic)
-                        subject_name = subject.name if subject else 'General'
-                        question_metadata.append({
-                            'topic': topic,
-                            'difficulty': diff_config['level'],
-                            'type': diff_config['type'],
-                            'index': i + 1,
-                            'subject': subject_name
-                        })
-
-            logger.info(f"Generating {len(question_metadata)} questions using AGENTIC RAG...")
-            logger.info(f"Generating {len(question_metadata)} questions in 3 batches of 3...")
+                        question_metadata.append(
+                            QuestionMeta(topic, diff_config['level'], diff_config['type'], i + 1, subject_name)
+                        )
+            
+            # While the circuit breaker is cooling down every question would fall back anyway, so skip Bedrock entirely
+            if self.request_queue.is_cooling_down():
+                logger.info("🔴 Circuit breaker active - building the whole quiz from fallback templates")
+                return self._build_quiz_from_fallbacks(question_metadata, selected_topics, selected_syllabi)
             
-            # Process questions in batches of 3 for better organization
-            batch_size = 3
-            total_batches = (len(question_metadata) + batch_size - 1) // batch_size
+            # Step 1: Retrieve syllabus content for all topics in a single batched request
+            syllabus_topics = []
+            for topic in selected_topics:
+                subject = self.get_subject_by_topic(topic)
+                if subject:
+                    syllabus_topics.append((topic, subject))
             
-            question_results = []
+            syllabus_content = await self._fetch_batch_syllabus(syllabus_topics, syllabus_deadline)
             
-            for i in range(0, len(question_metadata), batch_size):
-                current_batch = i//batch_size + 1
-                batch_metadata = question_metadata[i:i+batch_size]
+            # Fall back to per-topic lookups (bounded to avoid throttling) only for topics the batch missed
+            missing_topics = [(topic, subject) for topic, subject in syllabus_topics if topic not in syllabus_content]
+            if missing_topics:
+                logger.warning(f"⚠️ Batched syllabus lookup missed {len(missing_topics)} topic(s), retrieving individually")
+                syllabus_semaphore = asyncio.Semaphore(3)
                 
-                logger.info(f"Processing batch {current_batch}/{total_batches} ({len(batch_metadata)} questions)")
-                
-                # SEQUENTIAL PROCESSING: Process questions one at a time with EXTREME delays
-                try:
-                    batch_results = []
-                    
-                    for j, metadata in enumerate(batch_metadata):
-                        logger.info(f"Processing question {j+1}/{len(batch_metadata)} in batch {current_batch}")
-                        
-                        if metadata['type'] == 'mcq':
-                            question_prompt = f"""
-                            Generate a {metadata['difficulty']} difficulty multiple choice question for '{metadata['topic']}' ({metadata['subject']}).
-                            
-                            REQUIREMENTS:
-                            - Singapore O-Level standard
-                            - Question must be different from previous questions
-                            - Include variety in scenarios and values
-                            
-                            FORMAT (use exactly this structure):
-                            **Question:** [Clear, concise question text]
-                            
-                            **Options:**
-                            A) [Option 1]
-                            B) [Option 2] 
-                            C) [Option 3]
-                            D) [Option 4]
-                            
-                            **Correct Answer:** [Exact option text from above]
-                            
-                            **Explanation:** [Brief explanation of why this answer is correct]
-                            """
-                        else:
-                            question_prompt = f"""
-                            Generate a {metadata['difficulty']} difficulty structured question for '{metadata['topic']}' ({metadata['subject']}).
-                            
-                            REQUIREMENTS:
-                            - Singapore O-Level standard
-                            - Question must be different from previous questions
-                            - Should require detailed working/explanation
-                            
-                            FORMAT (use exactly this structure):
-                            **Question:** [Clear question requiring detailed answer]
-                            
-                            **Correct Answer:** [Complete model answer with working]
-                            
-                            **Explanation:** [Brief explanation of the approach/method]
-                            """
-                        
-                        # Check circuit breaker before attempting AI call
-                        if self.request_queue.should_attempt_call() and not self.request_queue.is_circuit_open:
-                            try:
-                                # Apply minimal delay to prevent throttling
-                                delay = await self.request_queue.get_request_delay()
-                                if delay > 0:
-                                    await asyncio.sleep(delay)
-                                
-                                self.request_queue.last_request_time = time.time()
-                                
-                                # Try to create fresh agent
-                                fresh_agent = self._create_fresh_question_agent()
-                                
-                                if fresh_agent is None:
-                                    # Agent creation failed, use fallback immediately
-                                    raise Exception("Agent creation failed - using fallback")
-                                
-                                logger.info(f"🤖 Generating question for {metadata['topic']} {metadata['difficulty']}")
-                                
-                                # Use exponential backoff handler for question generation with shorter timeout
-                                result = await asyncio.wait_for(
-                                    self._invoke_agent_with_backoff(fresh_agent, question_prompt),
-                                    timeout=30.0  # 30 seconds - faster timeout with smart fallback
-                                )
-                                
-                                batch_results.append(result)
-                                self.request_queue.record_success()
-                                logger.info(f"✅ Generated question for {metadata['topic']} {metadata['difficulty']}")
-                                
-                            except asyncio.TimeoutError:
-                                logger.warning(f"⏱️ AI generation timed out for {metadata['topic']} {metadata['difficulty']}")
-                                logger.info("🔄 Switching to template questions for remaining items...")
-                                self.request_queue.record_failure()
-                                # Get proper fallback question from templates
-                                fallback_question = self._get_fallback_question_for_difficulty(metadata['topic'], metadata['difficulty'])
-                                mock_response = type('MockResponse', (), {
-                                    'message': self._format_fallback_as_ai_response(fallback_question, metadata['type'])
-                                })()
-                                batch_results.append(mock_response)
-                                
-                            except Exception as e:
-                                error_str = str(e)
-                                if "ThrottlingException" in error_str or "Too many requests" in error_str:
-                                    logger.warning(f"🚫 AWS Throttling detected for {metadata['topic']} {metadata['difficulty']}")
-                                    logger.info("💡 Increasing delays to prevent future throttling...")
-                                    # Increase delay for future requests
-                                    self.request_queue.min_request_gap = min(30.0, self.request_queue.min_request_gap * 1.5)
-                                else:
-                                    logger.warning(f"⚠️ AI generation failed for {metadata['topic']} {metadata['difficulty']}: {e}")
-                                
-                                self.request_queue.record_failure()
-                                # Get proper fallback question from templates
-                                fallback_question = self._get_fallback_question_for_difficulty(metadata['topic'], metadata['difficulty'])
-                                mock_response = type('MockResponse', (), {
-                                    'message': self._format_fallback_as_ai_response(fallback_question, metadata['type'])
-                                })()
-                                batch_results.append(mock_response)
-                        else:
-                            logger.info(f"🔴 Circuit breaker active - using fallback for {metadata['topic']} {metadata['difficulty']}")
-                            # Use proper fallback questions from templates
-                            fallback_question = self._get_fallback_question_for_difficulty(metadata['topic'], metadata['difficulty'])
-                            mock_response = type('MockResponse', (), {
-                                'message': self._format_fallback_as_ai_response(fallback_question, metadata['type'])
-                            })()
-                            batch_results.append(mock_response)
-                    
-                    question_results.extend(batch_results)
+                async def fetch_topic_syllabus(topic: str, subject: Subject) -> str:
+                    content_query = f"Retrieve detailed syllabus content for {topic} from Singapore O-Level {subject.name} syllabus {subject.syllabus}"
                     
-                    # Shorter delay between batches for better user experience
-                    if self.request_queue.is_circuit_open:
-                        logger.info("Circuit breaker active: using fallback questions for remaining batches")
-                        # Continue to process remaining batches with fallback questions only
-                        # Don't break - we need all 9 questions
-                    else:
-                        logger.info("Normal processing: minimal delay before next batch")
-                        await asyncio.sleep(2.0)
-                        
-                except Exception as e:
-                    logger.error(f"Batch-level error: {e}")
-                    # Fill with fallback questions
-                    for metadata in batch_metadata:
-                        mock_response = type('MockResponse', (), {
-                            'message': f"Fallback {metadata['difficulty']} {metadata['type']} question for {metadata['topic']}"
-                        })()
-                        question_results.append(mock_response)
+                    async with syllabus_semaphore:
+                        try:
+                            # Use exponential backoff handler for AWS Bedrock throttling
+                            result = await asyncio.wait_for(
+                                self._invoke_agent_with_backoff(self._create_rag_agent(), content_query),
+                                timeout=max(0.0, min(60.0, syllabus_deadline - _monotonic()))  # Allow time for backoff retries, within the syllabus budget
+                            )
+                            logger.info(f"✅ Retrieved syllabus content for {topic} with exponential backoff")
+                            return result.message
+                        except asyncio.TimeoutError:
+                            logger.warning(f"⏱️ Timeout retrieving syllabus for {topic} (including retries), using fallback content")
+                            return f"Fallback content for {topic}"
+                        except Exception as e:
+                            logger.error(f"❌ Failed to retrieve syllabus for {topic} after exponential backoff: {e}")
+                            return f"Fallback content for {topic}"
+                
+                syllabus_results = await asyncio.gather(
+                    *(fetch_topic_syllabus(topic, subject) for topic, subject in missing_topics)
+                )
+                syllabus_content.update(
+                    (topic, content) for (topic, _), content in zip(missing_topics, syllabus_results)
+                )
+            
+            # Step 2: Generate questions
+            logger.info(f"Generating {len(question_metadata)} questions concurrently using AGENTIC RAG...")
+            
+            # Questions sharing a (topic, difficulty, type) have the same prompt, so request them together
+            question_groups: Dict[Tuple[str, str, str], List[QuestionMeta]] = {}
+            for metadata in question_metadata:
+                question_groups.setdefault((metadata.topic, metadata.difficulty, metadata.type), []).append(metadata)
+            
+            # Launch every group at once; the token bucket and backoff handler pace the Bedrock calls
+            group_results = await asyncio.gather(
+                *(self._generate_question_group(group, deadline) for group in question_groups.values())
+            )
             
-            # Process results into Question objects with structured parsing
-            valid_questions = []
-            invalid_count = 0
+            # Groups were built in metadata order, so flattening restores the original order
+            question_results = [result for results in group_results for result in results]
             
-            for result, metadata in zip(question_results, question_metadata):
+            return self._build_quiz_data(question_results, question_metadata, selected_topics, selected_syllabi)
+            
+        except Exception as e:
+            logger.error(f"Failed to start quiz: {str(e)}")
+            raise
+    
+    def _build_quiz_data(self, question_results: List[Any], question_metadata: List[QuestionMeta],
+                         selected_topics: List[str], selected_syllabi: List[str]) -> Dict[str, Any]:
+        """Turn per-question results (AI responses or template fallbacks) into the quiz payload"""
+        # Parse results straight into the quiz payload in a single pass
+        valid_questions: List[Question] = []
+        invalid_count = 0
+        
+        for result, metadata in zip(question_results, question_metadata):
+            if isinstance(result, _ParsedResult):
+                parsed_question = result.parsed
+            elif isinstance(result, _FallbackResult):
+                # Template fallbacks are already structured
+                parsed_question = self._format_fallback_as_parsed_question(result.template, metadata.type)
+            else:
                 # Extract raw text content from the AI response
                 raw_text = self.extract_question_content(result)
                 
                 # Parse into structured components using new parser
-                parsed_question = self.parse_structured_question(raw_text, metadata['type'])
+                parsed_question = self.parse_structured_question(raw_text, metadata.type)
+            question_text = parsed_question['question']
+            
+            # Validate question has meaningful content
+            if len(question_text.strip()) > 10 and not question_text.startswith('Fallback'):
+                valid_questions.append({
+                    'id': f"{metadata.topic}_{metadata.difficulty}_{metadata.index}",
+                    'topic': metadata.topic,
+                    'subject': metadata.subject,
+                    'difficulty': metadata.difficulty,
+                    'type': metadata.type,
+                    'question': question_text,
+                    'options': parsed_question['options'],  # Properly parsed options for MCQ
+                    'correct_answer': parsed_question['correct_answer'],  # Actual extracted answer
+                    'explanation': parsed_question['explanation']  # Extracted explanation
+                })
+                logger.info(f"✅ Processed {metadata.type} question: {question_text[:100]}...")
+            else:
+                invalid_count += 1
+                logger.warning(f"Invalid or fallback question generated for {metadata.topic} {metadata.difficulty}")
+        
+        # Convert to quiz data format
+        quiz_data = {
+            'questions': valid_questions,
+            'total_questions': len(valid_questions),
+            'invalid_questions': invalid_count,
+            'topics': selected_topics,
+            'syllabi_used': selected_syllabi,
+            'generation_timestamp': datetime.now().isoformat(),
+            'agentic_rag_used': True
+        }
+        
+        logger.info(f"Generated {len(valid_questions)} valid questions, {invalid_count} fallback questions")
+        return quiz_data
+    
+    def _build_quiz_from_fallbacks(self, question_metadata: List[QuestionMeta],
+                                   selected_topics: List[str], selected_syllabi: List[str]) -> Dict[str, Any]:
+        """Build the quiz purely from fallback templates, without any Bedrock calls"""
+        question_results = [
+            _FallbackResult(self._get_fallback_question_for_difficulty(metadata.topic, metadata.difficulty))
+            for metadata in question_metadata
+        ]
+        return self._build_quiz_data(question_results, question_metadata, selected_topics, selected_syllabi)
+    
+    async def _generate_question_group(self, group: List[QuestionMeta], deadline: float) -> List[Any]:
+        """Generate AI responses for questions sharing a (topic, difficulty, type) with one call.
+        
+        Returns one result per metadata entry, in order: the AI (or cached) response, or a
+        template fallback for any question the call could not supply.
+        """
+        first = group[0]
+        label = f"{first.topic} {first.difficulty}"
+        results: List[Any] = [None] * len(group)
+        
+        pending = []  # (position, metadata, cache_key) for questions not served from the cache
+        for position, metadata in enumerate(group):
+            cache_key = _question_cache.next_key((metadata.topic, metadata.difficulty, metadata.type, metadata.index))
+            cached_text = _question_cache.get(cache_key)
+            if cached_text is not None:
+                logger.info("♻️ Using cached question for %s", label)
+                results[position] = _ParsedResult(self.parse_structured_question(cached_text, metadata.type))
+            else:
+                pending.append((position, metadata, cache_key))
+        
+        if not pending:
+            return results
+        
+        question_prompt = _PROMPT_BY_TYPE[first.type].format(**first._asdict())
+        if len(pending) > 1:
+            question_prompt += _VARIANTS_INSTRUCTIONS.format(count=len(pending))
+        
+        question_texts = []
+        if _monotonic() >= deadline:
+            logger.info("⏰ Quiz time budget spent - using fallback for %s", label)
+        # Check circuit breaker before attempting AI call
+        elif self.request_queue.should_attempt_call():
+            budget_limited = False
+            try:
+                # Wait for a token from the client-side rate limiter
+                await self.bucket.acquire()
+                
+                # The rate limiter can wait a long time; a spent budget is not a Bedrock failure
+                remaining = deadline - _monotonic()
+                if remaining <= 0:
+                    raise _BudgetSpent()
+                
+                # Reuse an idle agent (one per in-flight call), creating one if needed
+                question_agent = self._acquire_question_agent()
+                
+                if question_agent is None:
+                    # Agent creation failed, use fallback immediately
+                    raise Exception("Agent creation failed - using fallback")
+                
+                logger.info("🤖 Generating %d question(s) for %s", len(pending), label)
                 
-                question = Question(
-                    id=f"{metadata['topic']}_{metadata['difficulty']}_{metadata['index']}",
-                    topic=metadata['topic'],
-                    subject=metadata['subject'],
-                    difficulty=metadata['difficulty'],
-                    type=metadata['type'],
-                    question=parsed_question['question'],
-                    options=parsed_question['options'],  # Properly parsed options for MCQ
-                    correct_answer=parsed_question['correct_answer'],  # Actual extracted answer
-                    explanation=parsed_question['explanation']  # Extracted explanation
+                # Several questions take longer to write; never run past the quiz deadline
+                call_timeout = 60.0 if len(pending) > 1 else 30.0
+                budget_limited = remaining < call_timeout
+                
+                # Use exponential backoff handler for question generation
+                result = await asyncio.wait_for(
+                    self._invoke_agent_with_backoff(question_agent, question_prompt),
+                    timeout=min(call_timeout, remaining)
                 )
                 
-                # Validate question has meaningful content
-                if len(question.question.strip()) > 10 and not question.question.startswith('Fallback'):
-                    valid_questions.append(question)
-                    logger.info(f"✅ Processed {metadata['type']} question: {question.question[:100]}...")
+                # Only agents that completed cleanly go back to the pool; failed ones are dropped
+                self._release_question_agent(question_agent)
+                self.request_queue.record_success()
+                self.bucket.on_success()
+                
+                response_text = self.extract_question_content(result)
+                if len(pending) > 1:
+                    question_texts = [text.strip() for text in _VARIANT_SEPARATOR_RE.split(response_text) if text.strip()]
                 else:
-                    invalid_count += 1
-                    logger.warning(f"Invalid or fallback question generated for {metadata['topic']} {metadata['difficulty']}")
-            
-            # Convert to quiz data format
-            quiz_data = {
-                'questions': [
-                    {
-                        'id': q.id,
-                        'topic': q.topic,
-                        'subject': q.subject,
-                        'difficulty': q.difficulty,
-                        'type': q.type,
-                        'question': q.question,
-                        'options': q.options,
-                        'correct_answer': q.correct_answer,
-                        'explanation': q.explanation
-                    } for q in valid_questions
-                ],
-                'total_questions': len(valid_questions),
-                'invalid_questions': invalid_count,
-                'topics': selected_topics,
-                'syllabi_used': selected_syllabi,
-                'generation_timestamp': datetime.now().isoformat(),
-                'agentic_rag_used': True
-            }
-            
-            logger.info(f"Generated {len(valid_questions)} valid questions, {invalid_count} fallback questions")
-            logger.info(f"Generated {len(generated_questions)} questions for quiz session")
-            return quiz_data
-            
-        except Exception as e:
-            logger.error(f"Failed to start quiz: {str(e)}")
-            raise
+                    question_texts = [response_text]
+                logger.info("✅ Generated %d/%d question(s) for %s", min(len(question_texts), len(pending)), len(pending), label)
+                
+            except _BudgetSpent:
+                logger.info("⏰ Quiz time budget spent while rate limited - using fallback for %s", label)
+                self.request_queue.cancel_attempt()
+                
+            except asyncio.TimeoutError:
+                if budget_limited:
+                    # Cut short by the quiz budget rather than a slow Bedrock call, so don't count it against the breaker
+                    logger.warning("⏱️ Quiz time budget ran out while generating %s", label)
+                    self.request_queue.cancel_attempt()
+                else:
+                    logger.warning("⏱️ AI generation timed out for %s", label)
+                    self.request_queue.record_failure()
+                logger.info("🔄 Switching to template questions for remaining items...")
+                
+            except Exception as e:
+                if _is_throttling(e):
+                    logger.warning("🚫 AWS Throttling detected for %s", label)
+                    # Halve the request rate for future requests
+                    self.bucket.on_throttle()
+                else:
+                    logger.warning("⚠️ AI generation failed for %s: %s", label, e)
+                
+                self.request_queue.record_failure()
+        else:
+            logger.info("🔴 Circuit breaker active - using fallback for %s", label)
+        
+        for (position, metadata, cache_key), question_text in zip(pending, question_texts):
+            # Parse once here; _build_quiz_data reuses the result
+            parsed_question = self.parse_structured_question(question_text, metadata.type)
+            results[position] = _ParsedResult(parsed_question)
+            # Only cache responses that parse into a usable question
+            if len(parsed_question['question'].strip()) > 10:
+                _question_cache.put(cache_key, question_text)
+        
+        # Use proper fallback questions from templates for anything the AI didn't supply
+        for position, metadata, _ in pending[len(question_texts):]:
+            results[position] = _FallbackResult(self._get_fallback_question_for_difficulty(metadata.topic, metadata.difficulty))
+        
+        return results
     
     def start_quiz(self, selected_topics: List[str]) -> Dict[str, Any]:
         """
@@ -890,52 +1316,45 @@ class EvaluationQuizAgent:
         try:
             return asyncio.run(self.start_quiz_async(selected_topics))
         except Exception as e:
-            logger.error(f"❌ Quiz generation timed out after 120 seconds: {e}")
+            logger.error(f"❌ Quiz generation failed: {e}")
             logger.warning("🔄 Generating fallback questions without Strands SDK")
             # Return fallback quiz data
             return self._generate_fallback_questions(selected_topics)
     
-    def _format_fallback_as_ai_response(self, fallback_question: Dict[str, Any], question_type: str) -> str:
-        """Format a fallback question as if it came from AI generation"""
+    def _format_fallback_as_parsed_question(self, fallback_question: Mapping[str, Any], question_type: str) -> Dict[str, Any]:
+        """Shape a fallback template like parse_structured_question output"""
+        options = None
         if question_type == 'mcq':
-            formatted_options = '\n'.join([f"{chr(65+i)}) {option}" for i, option in enumerate(fallback_question.get('options', []))])
-            return f"""**Question:** {fallback_question['question']}
-
-**Options:**
-{formatted_options}
-
-**Correct Answer:** {fallback_question['correct_answer']}
-
-**Explanation:** {fallback_question.get('explanation', f"This {fallback_question['difficulty']} question tests understanding of the topic.")}"""
-        else:
-            return f"""**Question:** {fallback_question['question']}
-
-**Correct Answer:** {fallback_question['correct_answer']}
-
-**Explanation:** {fallback_question.get('explanation', f"This {fallback_question['difficulty']} question requires detailed working and explanation.")}"""
-
-    def _get_fallback_question_for_difficulty(self, topic: str, difficulty: str) -> Dict[str, Any]:
-        """Get a fallback question for a specific topic and difficulty"""
-        # Initialize counter if not exists
-        if not hasattr(self, '_fallback_counters'):
-            self._fallback_counters = {}
+            options = list(fallback_question.get('options') or [])[:4]
+            if len(options) < 2:
+                options = None
         
-        # Get the fallback templates (same as in _generate_fallback_questions)
-        fallback_templates = self._get_fallback_templates()
+        # Only build the generic explanation when the template doesn't carry its own
+        explanation = fallback_question.get('explanation')
+        if explanation is None:
+            if question_type == 'mcq':
+                explanation = f"This {fallback_question['difficulty']} question tests understanding of the topic."
+            else:
+                explanation = f"This {fallback_question['difficulty']} question requires detailed working and explanation."
         
+        return {
+            'question': fallback_question['question'],
+            'options': options,
+            'correct_answer': fallback_question.get('correct_answer') or 'Answer not specified',
+            'explanation': explanation
+        }
+
+    def _get_fallback_question_for_difficulty(self, topic: str, difficulty: str) -> Mapping[str, Any]:
+        """Get a fallback question for a specific topic and difficulty"""
         # Find questions for the topic
         subject = self.get_subject_by_topic(topic)
-        if subject and subject.name in fallback_templates:
-            topic_questions = fallback_templates[subject.name].get(topic, [])
-            
-            # Find all questions with matching difficulty
-            matching_questions = [q for q in topic_questions if q.get('difficulty') == difficulty]
+        if subject and subject.name in _FALLBACK_TEMPLATES:
+            # All questions with matching difficulty
+            matching_questions = _FALLBACK_BY_TOPIC_DIFF.get((topic, difficulty))
             
             if matching_questions:
                 # Use counter to cycle through different questions of same difficulty
                 counter_key = f"{topic}_{difficulty}"
-                if counter_key not in self._fallback_counters:
-                    self._fallback_counters[counter_key] = 0
                 
                 # Get the next question in rotation
                 question_index = self._fallback_counters[counter_key] % len(matching_questions)
@@ -944,6 +1363,7 @@ class EvaluationQuizAgent:
                 return matching_questions[question_index]
                     
             # If no exact match, return the first question of that topic
+            topic_questions = _FALLBACK_TEMPLATES[subject.name].get(topic)
             if topic_questions:
                 return topic_questions[0]
         
@@ -956,302 +1376,43 @@ class EvaluationQuizAgent:
             'type': 'mcq'
         }
     
-    def _get_fallback_templates(self) -> Dict[str, Dict[str, List[Dict]]]:
+    def _get_fallback_templates(self) -> Dict[str, Dict[str, Sequence[Mapping[str, Any]]]]:
         """Get the fallback question templates"""
-        return {
-            'Physics': {
-                'Kinematics': [
-                    # Easy (3 questions): Concept Identification - MCQ
-                    {
-                        'question': 'Which of the following best defines acceleration?',
-                        'options': ['Rate of change of distance', 'Rate of change of velocity', 'Rate of change of position', 'Rate of change of speed'],
-                        'correct_answer': 'Rate of change of velocity',
-                        'difficulty': 'easy',
-                        'type': 'mcq'
-                    },
-                    {
-                        'question': 'A car moving at constant speed in a circle is accelerating. Which statement explains why?',
-                        'options': ['Speed is changing', 'Direction is changing', 'Both speed and direction changing', 'No acceleration occurs'],
-                        'correct_answer': 'Direction is changing',
-                        'difficulty': 'easy',
-                        'type': 'mcq'
-                    },
-                    {
-                        'question': 'Which graph represents uniform acceleration?',
-                        'options': ['Straight line on v-t graph', 'Curved line on s-t graph', 'Both A and B', 'Neither A nor B'],
-                        'correct_answer': 'Both A and B',
-                        'difficulty': 'easy',
-                        'type': 'mcq'
-                    },
-                    # Medium (3 questions): Single-Formula Application - Structured
-                    {
-                        'question': 'A ball is dropped from rest. Calculate its velocity after falling for 3.0 s, assuming g = 9.81 m/s².',
-                        'correct_answer': '29.4 m/s',
-                        'difficulty': 'medium',
-                        'type': 'structured'
-                    },
-                    {
-                        'question': 'A car accelerates from rest at 2 m/s² for 10 seconds. What is its final velocity?',
-                        'correct_answer': '20 m/s',
-                        'difficulty': 'medium',
-                        'type': 'structured'
-                    },
-                    {
-                        'question': 'An object travels 100m in 5 seconds with constant acceleration from rest. Find the acceleration.',
-                        'correct_answer': '8 m/s²',
-                        'difficulty': 'medium',
-                        'type': 'structured'
-                    },
-                    # Hard (3 questions): Multi-Step Application - Structured
-                    {
-                        'question': 'A car accelerates from 10 m/s to 30 m/s over a distance of 150 m. Calculate the time taken for this acceleration.',
-                        'correct_answer': '7.5 s',
-                        'difficulty': 'hard',
-                        'type': 'structured'
-                    },
-                    {
-                        'question': 'An object is thrown upward at 20 m/s. Calculate the maximum height reached and time to return to ground (g = 10 m/s²).',
-                        'correct_answer': 'Height: 20 m, Time: 4 s',
-                        'difficulty': 'hard',
-                        'type': 'structured'
-                    },
-                    {
-                        'question': 'A train decelerates uniformly from 25 m/s to rest in 200 m. Find the deceleration and time taken.',
-                        'correct_answer': 'Deceleration: 1.56 m/s², Time: 16 s',
-                        'difficulty': 'hard',
-                        'type': 'structured'
-                    }
-                ]
-            },
-            'Elementary Mathematics': {
-                'Algebra: Solving linear/quadratic equations': [
-                    # Easy (3 questions): Basic algebra - MCQ
-                    {
-                        'question': 'What is the solution to the equation: 2x + 6 = 14?',
-                        'options': ['x = 2', 'x = 4', 'x = 6', 'x = 8'],
-                        'correct_answer': 'x = 4',
-                        'difficulty': 'easy',
-                        'type': 'mcq'
-                    },
-                    {
-                        'question': 'Which of the following is a quadratic equation?',
-                        'options': ['2x + 3 = 7', 'x² + 5x + 6 = 0', '3x - 1 = 8', 'x/2 = 4'],
-                        'correct_answer': 'x² + 5x + 6 = 0',
-                        'difficulty': 'easy',
-                        'type': 'mcq'
-                    },
-                    {
-                        'question': 'What is the standard form of a quadratic equation?',
-                        'options': ['ax + b = 0', 'ax² + bx + c = 0', 'x = a + b', 'y = mx + c'],
-                        'correct_answer': 'ax² + bx + c = 0',
-                        'difficulty': 'easy',
-                        'type': 'mcq'
-                    },
-                    # Medium (3 questions): Applied algebra - Structured
-                    {
-                        'question': 'Solve for x: 3x - 7 = 2x + 5. Show your working.',
-                        'correct_answer': '3x - 7 = 2x + 5\n3x - 2x = 5 + 7\nx = 12',
-                        'difficulty': 'medium',
-                        'type': 'structured'
-                    },
-                    {
-                        'question': 'Factorize the quadratic expression: x² + 7x + 12',
-                        'correct_answer': 'x² + 7x + 12 = (x + 3)(x + 4)',
-                        'difficulty': 'medium',
-                        'type': 'structured'
-                    },
-                    {
-                        'question': 'Solve the quadratic equation: x² - 5x + 6 = 0',
-                        'correct_answer': 'x² - 5x + 6 = 0\n(x - 2)(x - 3) = 0\nx = 2 or x = 3',
-                        'difficulty': 'medium',
-                        'type': 'structured'
-                    },
-                    # Hard (3 questions): Complex problem-solving - Structured
-                    {
-                        'question': 'A rectangular garden has length (x + 4) meters and width (x - 2) meters. If the area is 48 square meters, find the value of x.',
-                        'correct_answer': 'Area = length × width\n48 = (x + 4)(x - 2)\n48 = x² + 2x - 8\nx² + 2x - 56 = 0\n(x + 8)(x - 7) = 0\nx = 7 (since x must be positive)',
-                        'difficulty': 'hard',
-                        'type': 'structured'
-                    },
-                    {
-                        'question': 'Use the quadratic formula to solve: 2x² + 3x - 2 = 0',
-                        'correct_answer': 'Using x = (-b ± √(b² - 4ac))/2a\na = 2, b = 3, c = -2\nx = (-3 ± √(9 + 16))/4 = (-3 ± 5)/4\nx = 1/2 or x = -2',
-                        'difficulty': 'hard',
-                        'type': 'structured'
-                    },
-                    {
-                        'question': 'A ball is thrown upward. Its height h (in meters) after t seconds is given by h = -5t² + 20t + 25. Find when the ball reaches its maximum height.',
-                        'correct_answer': 'Maximum occurs at t = -b/2a = -20/(2×-5) = 2 seconds\nMaximum height = -5(2)² + 20(2) + 25 = 45 meters',
-                        'difficulty': 'hard',
-                        'type': 'structured'
-                    }
-                ],
-                'Geometry: Circle theorems': [
-                    # Easy (3 questions): Basic circle concepts - MCQ
-                    {
-                        'question': 'What is the relationship between the radius and diameter of a circle?',
-                        'options': ['Diameter = 2 × radius', 'Radius = 2 × diameter', 'Diameter = radius²', 'They are equal'],
-                        'correct_answer': 'Diameter = 2 × radius',
-                        'difficulty': 'easy',
-                        'type': 'mcq'
-                    },
-                    {
-                        'question': 'What is the angle in a semicircle?',
-                        'options': ['45°', '60°', '90°', '180°'],
-                        'correct_answer': '90°',
-                        'difficulty': 'easy',
-                        'type': 'mcq'
-                    },
-                    {
-                        'question': 'Which theorem states that the angle subtended by an arc at the center is twice the angle subtended by the same arc at any point on the circle?',
-                        'options': ['Pythagorean theorem', 'Angle at center theorem', 'Inscribed angle theorem', 'Tangent theorem'],
-                        'correct_answer': 'Angle at center theorem',
-                        'difficulty': 'easy',
-                        'type': 'mcq'
-                    },
-                    # Medium (3 questions): Circle theorem applications - Structured
-                    {
-                        'question': 'In a circle, if an inscribed angle is 35°, what is the central angle subtending the same arc?',
-                        'correct_answer': 'Central angle = 2 × inscribed angle = 2 × 35° = 70°',
-                        'difficulty': 'medium',
-                        'type': 'structured'
-                    },
-                    {
-                        'question': 'A chord is 8 cm from the center of a circle with radius 10 cm. Find the length of the chord.',
-                        'correct_answer': 'Using Pythagorean theorem: half chord = √(10² - 8²) = √36 = 6 cm\nFull chord length = 2 × 6 = 12 cm',
-                        'difficulty': 'medium',
-                        'type': 'structured'
-                    },
-                    {
-                        'question': 'Two tangents from an external point to a circle form an angle of 60°. If the radius is 5 cm, find the distance from the external point to the center.',
-                        'correct_answer': 'Using tangent properties: distance = radius/sin(30°) = 5/0.5 = 10 cm',
-                        'difficulty': 'medium',
-                        'type': 'structured'
-                    },
-                    # Hard (3 questions): Complex circle problems - Structured  
-                    {
-                        'question': 'Prove that opposite angles in a cyclic quadrilateral are supplementary.',
-                        'correct_answer': 'In cyclic quadrilateral ABCD: ∠A + ∠C = 180° and ∠B + ∠D = 180°\nThis is because each pair subtends arcs that complete the full circle (360°), so inscribed angles sum to 180°.',
-                        'difficulty': 'hard',
-                        'type': 'structured'
-                    },
-                    {
-                        'question': 'A tangent and a secant are drawn to a circle from the same external point. If the tangent length is 12 cm and the external segment of the secant is 8 cm, find the total length of the secant.',
-                        'correct_answer': 'Using tangent-secant theorem: tangent² = external segment × whole secant\n12² = 8 × whole secant\n144 = 8 × whole secant\nWhole secant = 18 cm',
-                        'difficulty': 'hard',
-                        'type': 'structured'
-                    },
-                    {
-                        'question': 'In a circle with center O, chord AB subtends an angle of 120° at the center. If the radius is 6 cm, find the area of the sector AOB.',
-                        'correct_answer': 'Area of sector = (θ/360°) × πr²\nArea = (120°/360°) × π × 6²\nArea = (1/3) × π × 36 = 12π cm²',
-                        'difficulty': 'hard',
-                        'type': 'structured'
-                    }
-                ]
-            },
-            'English Language': {
-                'Comprehension and Language Use': [
-                    # Easy (3 questions): Basic comprehension - MCQ
-                    {
-                        'question': 'What is the main purpose of reading comprehension in English?',
-                        'options': ['To memorize words', 'To understand meaning and context', 'To speak fluently', 'To write essays'],
-                        'correct_answer': 'To understand meaning and context',
-                        'difficulty': 'easy',
-                        'type': 'mcq'
-                    },
-                    {
-                        'question': 'Which of the following is a literary device that compares two things using "like" or "as"?',
-                        'options': ['Metaphor', 'Simile', 'Personification', 'Alliteration'],
-                        'correct_answer': 'Simile',
-                        'difficulty': 'easy',
-                        'type': 'mcq'
-                    },
-                    {
-                        'question': 'In formal writing, what type of language should you avoid?',
-                        'options': ['Complex sentences', 'Proper grammar', 'Slang and colloquialisms', 'Varied vocabulary'],
-                        'correct_answer': 'Slang and colloquialisms',
-                        'difficulty': 'easy',
-                        'type': 'mcq'
-                    },
-                    # Medium (3 questions): Text analysis - Structured
-                    {
-                        'question': 'Read this sentence: "The wind whispered through the trees." Identify the literary device used and explain its effect on the reader.',
-                        'correct_answer': 'Personification. The wind is given human qualities (whispering), creating a peaceful, gentle atmosphere.',
-                        'difficulty': 'medium',
-                        'type': 'structured'
-                    },
-                    {
-                        'question': 'Explain the difference between fact and opinion in a text. Give one example of each.',
-                        'correct_answer': 'Facts are verifiable statements (e.g., "Singapore gained independence in 1965"). Opinions are personal views (e.g., "Singapore is the best country in Asia").',
-                        'difficulty': 'medium',
-                        'type': 'structured'
-                    },
-                    {
-                        'question': 'What is the purpose of using rhetorical questions in persuasive writing? Provide an example.',
-                        'correct_answer': 'To engage readers and make them think. Example: "Do we really want to destroy our planet for future generations?"',
-                        'difficulty': 'medium',
-                        'type': 'structured'
-                    },
-                    # Hard (3 questions): Critical analysis - Structured
-                    {
-                        'question': 'Analyze how the author uses tone and mood in a persuasive text to influence the reader. Discuss specific techniques.',
-                        'correct_answer': 'Authors use urgent tone (strong verbs, emotional language) and serious mood (statistics, consequences) to create emotional response and motivate action.',
-                        'difficulty': 'hard',
-                        'type': 'structured'
-                    },
-                    {
-                        'question': 'Compare and contrast the effectiveness of different text types (narrative, expository, persuasive) for communicating information.',
-                        'correct_answer': 'Narrative engages emotions through storytelling; expository provides clear facts; persuasive motivates action through argumentation. Each serves different purposes.',
-                        'difficulty': 'hard',
-                        'type': 'structured'
-                    },
-                    {
-                        'question': 'Evaluate the use of irony and satire in contemporary texts. How do these devices enhance meaning?',
-                        'correct_answer': 'Irony reveals contradictions and deeper meanings; satire criticizes society through humor. Both make readers think critically about issues.',
-                        'difficulty': 'hard',
-                        'type': 'structured'
-                    }
-                ]
-            }
-        }
+        return _FALLBACK_TEMPLATES
 
+    def _iter_fallback_questions(self, selected_topics: List[str]) -> Iterator[Dict[str, Any]]:
+        """Yield fallback quiz questions one at a time, for callers that stream them"""
+        # A repeated topic would just repeat its whole question set, so keep the first occurrence only
+        unique_topics = list(dict.fromkeys(selected_topics))
+        if len(unique_topics) != len(selected_topics):
+            logger.warning(f"⚠️ Dropped {len(selected_topics) - len(unique_topics)} duplicate topic(s) from fallback quiz")
+        
+        # Precomputed ids first, formatted ones only past the end of the pool
+        question_ids = itertools.chain(_FALLBACK_IDS, map('fallback_{}'.format, itertools.count(len(_FALLBACK_IDS) + 1)))
+        
+        # Same templates as the per-question fallback, prebuilt into quiz questions at import
+        return (
+            {'id': question_key, **base_question}
+            for question_key, base_question in zip(
+                question_ids,
+                (base_question for topic in unique_topics for base_question in _FALLBACK_QUESTIONS_BY_TOPIC.get(topic, ()))
+            )
+        )
+    
     def _generate_fallback_questions(self, selected_topics: List[str]) -> Dict[str, Any]:
         """
         PRESERVED: Fallback method for generating quiz questions when Strands SDK is unavailable
         This ensures the system always works even if AI fails
         """
         logger.info("🔄 Using fallback question generation (templates)")
-
-        # Use the same templates from the helper method
-        fallback_templates = self._get_fallback_templates()
-        
-        questions = []
-        question_id = 1
         
-        for topic in selected_topics:
-            subject = self.get_subject_by_topic(topic)
-            if subject and subject.name in fallback_templates:
-                topic_templates = fallback_templates[subject.name].get(topic, [])
-                
-                for template in topic_templates:
-                    questions.append({
-                        'id': f'fallback_{question_id}',
-                        'topic': topic,
-                        'subject': subject.name,
-                        'difficulty': template['difficulty'],
-                        'type': template['type'],
-                        'question': template['question'],
-                        'options': template.get('options'),
-                        'correct_answer': template['correct_answer'],
-                        'explanation': f"This is a fallback {template['difficulty']} question covering {topic} from Singapore O-Level {subject.name}."
-                    })
-                    question_id += 1
+        questions = list(self._iter_fallback_questions(selected_topics))
         
         return {
             'questions': questions,
             'total_questions': len(questions),
             'topics': selected_topics,
-            'generation_timestamp': datetime.now().isoformat(),
+            'generation_timestamp': _iso_now_cached(),
             'agentic_rag_used': False,
             'fallback_used': True
         }
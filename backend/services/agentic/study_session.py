@@ -15,12 +15,14 @@ Architecture:
 """
 
 import json
+import re
 import time
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, AsyncGenerator
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, AsyncGenerator, Callable, Mapping
+from dataclasses import dataclass, asdict, fields
+from types import MappingProxyType
 import os
 
 # AWS Strands SDK imports
@@ -28,6 +30,7 @@ try:
     from strands import Agent, tool
     from strands.models import BedrockModel  # For non-streaming configuration
     from strands_tools import use_aws  # Available AWS tools
+    from botocore.config import Config as BotocoreConfig
     STRANDS_AVAILABLE = True
 except ImportError as e:
     logging.warning(f"AWS Strands SDK not available: {e}")
@@ -37,10 +40,246 @@ except ImportError as e:
     runtime = None
     swarm = None
     BedrockModel = None
+    BotocoreConfig = None
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+_MODEL_ID = "us.anthropic.claude-sonnet-4-20250514-v1:0"
+
+# Routing keywords per category, in the priority order route_student_message applies them
+_ROUTE_KEYWORDS = (
+    ("start", ("start", "begin")),
+    ("practice", ("question", "practice", "test", "exam")),
+    ("explain", ("explain", "understand", "confused", "help", "clarify")),
+    ("visual", ("visual", "remember", "memorize", "diagram", "mind map", "mnemonic")),
+)
+
+# One case-insensitive pass over the message finds every keyword; the lookahead also reports overlapping matches
+_ROUTE_PATTERN = re.compile("(?=" + "|".join(
+    f"(?P<{category}>{'|'.join(map(re.escape, words))})" for category, words in _ROUTE_KEYWORDS
+) + ")", re.IGNORECASE)
+
+def _route_categories(msg: str) -> set:
+    """Keyword categories that occur anywhere in a student message, ignoring case"""
+    return {match.lastgroup for match in _ROUTE_PATTERN.finditer(msg)}
+
+def _build_session_plan(expertise_level: str, stressed: bool, unfocused: bool, exam_soon: bool) -> Dict[str, Any]:
+    """Strategy fields of a session plan for one bucket of the student profile"""
+    
+    # Decision matrix based on multiple factors
+    strategy = ""
+    learning_ratio = 50
+    practice_ratio = 50
+    primary_agent = "teacher"
+    intensity = "moderate"
+    initial_mode = "learning"
+
+    # Expertise-based decisions
+    if expertise_level == "beginner":
+        strategy = "Foundation Building"
+        learning_ratio = 80
+        practice_ratio = 20
+        primary_agent = "tutor"  # Socratic method for beginners
+        initial_mode = "learning"
+    elif expertise_level == "apprentice":
+        strategy = "Concept Application"
+        learning_ratio = 60
+        practice_ratio = 40
+        primary_agent = "teacher"
+        initial_mode = "learning"
+    elif expertise_level == "pro":
+        strategy = "Skill Refinement"
+        learning_ratio = 40
+        practice_ratio = 60
+        primary_agent = "teacher"  # More practice questions
+        initial_mode = "practice"
+    else:  # grandmaster
+        strategy = "Mastery Validation"
+        learning_ratio = 20
+        practice_ratio = 80
+        primary_agent = "perfect_scorer"  # Peer simulation
+        initial_mode = "practice"
+
+    # Stress/Focus adjustments
+    if stressed:
+        primary_agent = "perfect_scorer"  # Wellbeing focus
+        intensity = "gentle"
+        learning_ratio += 20  # More learning, less pressure
+        practice_ratio -= 20
+    elif unfocused:
+        primary_agent = "perfect_scorer"  # Visual aids help
+        intensity = "engaging"
+
+    # Time pressure adjustments
+    if exam_soon:  # Less than 30 days
+        strategy += " (Exam Focused)"
+        practice_ratio += 20  # More practice
+        learning_ratio -= 20
+        intensity = "intensive"
+
+    # Ensure ratios are valid
+    practice_ratio = 100 - learning_ratio
+
+    return {
+        "strategy": strategy,
+        "learning_ratio": learning_ratio,
+        "practice_ratio": practice_ratio,
+        "primary_agent": primary_agent,
+        "intensity": intensity,
+        "initial_mode": initial_mode
+    }
+
+# Every profile falls into one of these buckets, so the whole decision matrix is evaluated once at import
+_PLAN_EXPERTISE_LEVELS = ("beginner", "apprentice", "pro", "grandmaster")
+_PLAN_TABLE = {
+    (expertise_level, stressed, unfocused, exam_soon): _build_session_plan(expertise_level, stressed, unfocused, exam_soon)
+    for expertise_level in _PLAN_EXPERTISE_LEVELS
+    for stressed in (False, True)
+    for unfocused in (False, True)
+    for exam_soon in (False, True)
+}
+
+# Static tool content for the specialized agents, built once at import
+# This would integrate with your existing syllabus content
+_EXPLANATIONS = MappingProxyType({
+    "kinematics": """Let me explain kinematics step by step:
+
+1. **What is Kinematics?**
+   Kinematics is the study of motion without considering the forces that cause it.
+
+2. **Key Concepts:**
+   - Displacement (s): Change in position
+   - Velocity (v): Rate of change of displacement
+   - Acceleration (a): Rate of change of velocity
+
+3. **Essential Equations:**
+   - v = u + at
+   - s = ut + ½at²
+   - v² = u² + 2as
+
+Let's start with displacement. Can you think of an example where you moved from one position to another?""",
+    
+    "reading_comprehension": """Reading Comprehension involves three key skills:
+
+1. **Literal Comprehension**: What the text directly states
+2. **Inferential Comprehension**: What the text implies
+3. **Critical Analysis**: Author's purpose and techniques
+
+For O-Level success, focus on:
+- Identifying main ideas vs supporting details
+- Understanding context clues for vocabulary
+- Recognizing author's tone and purpose
+
+Would you like to practice with a sample passage?""",
+    
+    "algebra": """Algebraic problem-solving follows these steps:
+
+1. **Identify** what you're solving for
+2. **Set up** the equation using given information
+3. **Solve** systematically using algebraic rules
+4. **Check** your answer makes sense
+
+For linear equations: ax + b = c
+- Isolate the variable by undoing operations
+- Work backwards from the equals sign
+
+Ready to try a practice problem?"""
+})
+
+_PRACTICE_QUESTIONS = MappingProxyType({
+    "kinematics": {
+        "beginner": {
+            "question": "A car travels 60 meters in 12 seconds at constant velocity. Calculate the car's velocity.",
+            "answer": "5 m/s",
+            "working": "v = s/t = 60m ÷ 12s = 5 m/s",
+            "technique": "Always identify what's given and what you need to find. Use the appropriate kinematic equation."
+        },
+        "apprentice": {
+            "question": "A ball is dropped from rest and falls for 3.0 seconds. Calculate: (a) its final velocity (b) the distance fallen. (g = 9.81 m/s²)",
+            "answer": "(a) 29.4 m/s (b) 44.1 m",
+            "working": "(a) v = u + at = 0 + 9.81(3) = 29.4 m/s\n(b) s = ut + ½at² = 0 + ½(9.81)(3²) = 44.1 m",
+            "technique": "For free fall: u = 0, a = g. Use appropriate equations for each part."
+        }
+    },
+    "reading_comprehension": {
+        "beginner": {
+            "question": "Read this passage and answer: 'The expedition failed due to unexpected weather conditions.' What was the primary reason for failure?",
+            "answer": "Unexpected weather conditions",
+            "technique": "Look for explicit statements. The answer is directly stated in the text."
+        }
+    }
+})
+
+_VISUAL_AIDS = MappingProxyType({
+    "kinematics": {
+        "mind_map": """
+```mermaid
+mindmap
+  root((Kinematics))
+    Motion Concepts
+      Displacement (s)
+      Velocity (v) 
+      Acceleration (a)
+    Key Equations
+      v = u + at
+      s = ut + ½at²
+      v² = u² + 2as
+    Applications
+      Free Fall
+      Projectile Motion
+      Uniform Motion
+```""",
+        "mnemonic": "**SUV-AT** - Remember the kinematic equations with 'SUV AT':\n- **S** = ut + ½at² (displacement)\n- **U** = initial velocity\n- **V** = final velocity  \n- **A** = acceleration\n- **T** = time",
+        "diagram": "Velocity-Time Graph:\n↑ Velocity\n│   /\n│  /  ← slope = acceleration\n│ /\n│/\n└─────→ Time\nArea under curve = displacement"
+    },
+    "reading_comprehension": {
+        "mind_map": """
+```mermaid
+mindmap
+  root((Reading Comprehension))
+    Question Types
+      Literal
+        Direct facts
+        Explicit information
+      Inferential  
+        Implied meaning
+        Context clues
+      Critical
+        Author's purpose
+        Tone analysis
+    Answering Strategy
+      Read questions first
+      Skim for keywords
+      Quote with evidence
+      Check word limits
+```""",
+        "mnemonic": "**RICE** for Reading Comprehension:\n- **R**ead questions first\n- **I**dentify key information\n- **C**onnect evidence to answer\n- **E**xplain with quotes"
+    }
+})
+
+_PEER_PROMPTS = MappingProxyType({
+    "kinematics": "Pretend I'm your study buddy who's confused about acceleration. Explain to me the difference between velocity and acceleration using a real-world example.",
+    "reading_comprehension": "I'm struggling with inference questions. Explain to me how you identify what the author is implying without directly stating.",
+    "algebra": "Walk me through your problem-solving approach. How do you decide which method to use for different equation types?"
+})
+
+# Answering guidance used by provide_detailed_feedback, per topic
+_DEFAULT_FEEDBACK_GUIDANCE = MappingProxyType({
+    "technique": "For O-Level success, remember to:",
+    "keywords": "Key terms to include in your answer:"
+})
+_FEEDBACK_GUIDANCE = MappingProxyType({
+    "kinematics": {
+        "technique": "1. Write down given values\n2. Identify what to find\n3. Choose appropriate equation\n4. Substitute and solve\n5. Check units and reasonableness",
+        "keywords": "velocity, acceleration, displacement, time, equations of motion"
+    },
+    "reading_comprehension": {
+        "technique": "1. Read question first\n2. Skim passage for relevant sections\n3. Quote directly when asked\n4. Explain inference with evidence\n5. Check word count if specified",
+        "keywords": "according to the passage, the author suggests, this implies, evidence shows"
+    }
+})
+
+@dataclass(slots=True, frozen=True)
 class SessionContext:
     """Context passed to all agents"""
     user_id: str
@@ -54,7 +293,7 @@ class SessionContext:
     session_id: Optional[str] = None
     topic_progress: Optional[Dict[str, Any]] = None  # ADDED: Topic progression context (accepts topicProgress from frontend)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SessionPlan:
     """Orchestrator's session strategy"""
     strategy: str
@@ -66,7 +305,13 @@ class SessionPlan:
     time_to_exam: int
     adaptive_factors: Dict[str, bool]
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the plan's fields, without asdict's recursive deep copy"""
+        return {name: getattr(self, name) for name in _SESSION_PLAN_FIELDS}
+
+_SESSION_PLAN_FIELDS = tuple(field.name for field in fields(SessionPlan))
+
+@dataclass(slots=True, frozen=True)
 class AgentMessage:
     """Message from an agent"""
     agent_id: str
@@ -75,7 +320,7 @@ class AgentMessage:
     timestamp: datetime
     agent_tools_used: List[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class SessionData:
     """Complete session tracking data"""
     session_id: str
@@ -104,20 +349,35 @@ class StudySessionOrchestrator:
     
     def __init__(self):
         self.agent = None
-        self.specialized_agents = {}
+        self.model = None
+        self._agent_factories = {}
+        self._session_agents = {}  # session_id -> {agent_id: Agent}, so sessions never share conversation history
         self.active_sessions = {}
         
         if STRANDS_AVAILABLE:
+            self.model = self._create_shared_model()
             self._initialize_orchestrator_agent()
             self._initialize_specialized_agents()
         else:
             logger.warning("AWS Strands not available - running in simulation mode")
 
+    def _create_shared_model(self):
+        """Create the Bedrock model shared by the orchestrator and all specialized agents"""
+        # One model means one bedrock-runtime client, so every agent reuses the same connection pool
+        return BedrockModel(
+            model_id=_MODEL_ID,
+            streaming=False,  # CRITICAL: Inference profile models don't support ConverseStream
+            boto_client_config=BotocoreConfig(
+                max_pool_connections=32,
+                retries={"max_attempts": 3, "mode": "adaptive"}
+            )
+        )
+
     def _initialize_orchestrator_agent(self):
         """Initialize the central orchestrator agent"""
         
         @tool
-        async def analyze_student_profile(
+        def analyze_student_profile(
             expertise_level: str,
             focus_level: int,
             stress_level: int,
@@ -125,86 +385,29 @@ class StudySessionOrchestrator:
         ) -> Dict[str, Any]:
             """Analyze student profile and create optimal session strategy"""
             
-            # Decision matrix based on multiple factors
-            strategy = ""
-            learning_ratio = 50
-            practice_ratio = 50
-            primary_agent = "teacher"
-            intensity = "moderate"
-            initial_mode = "learning"
-
-            # Expertise-based decisions
-            if expertise_level == "beginner":
-                strategy = "Foundation Building"
-                learning_ratio = 80
-                practice_ratio = 20
-                primary_agent = "tutor"  # Socratic method for beginners
-                initial_mode = "learning"
-            elif expertise_level == "apprentice":
-                strategy = "Concept Application"
-                learning_ratio = 60
-                practice_ratio = 40
-                primary_agent = "teacher"
-                initial_mode = "learning"
-            elif expertise_level == "pro":
-                strategy = "Skill Refinement"
-                learning_ratio = 40
-                practice_ratio = 60
-                primary_agent = "teacher"  # More practice questions
-                initial_mode = "practice"
-            else:  # grandmaster
-                strategy = "Mastery Validation"
-                learning_ratio = 20
-                practice_ratio = 80
-                primary_agent = "perfect_scorer"  # Peer simulation
-                initial_mode = "practice"
-
-            # Stress/Focus adjustments
-            if stress_level > 4:
-                primary_agent = "perfect_scorer"  # Wellbeing focus
-                intensity = "gentle"
-                learning_ratio += 20  # More learning, less pressure
-                practice_ratio -= 20
-            elif focus_level < 2:
-                primary_agent = "perfect_scorer"  # Visual aids help
-                intensity = "engaging"
-
-            # Time pressure adjustments
-            if time_to_exam < 30:  # Less than 30 days
-                strategy += " (Exam Focused)"
-                practice_ratio += 20  # More practice
-                learning_ratio -= 20
-                intensity = "intensive"
-
-            # Ensure ratios are valid
-            practice_ratio = 100 - learning_ratio
-
-            return {
-                "strategy": strategy,
-                "learning_ratio": learning_ratio,
-                "practice_ratio": practice_ratio,
-                "primary_agent": primary_agent,
-                "intensity": intensity,
-                "initial_mode": initial_mode,
-                "time_to_exam": time_to_exam,
-                "adaptive_factors": {
-                    "expertise_based": True,
-                    "stress_considered": stress_level > 7,
-                    "focus_optimized": focus_level < 4,
-                    "exam_pressure": time_to_exam < 30
-                }
+            # Unknown expertise levels follow the grandmaster branch of the decision matrix
+            if expertise_level not in _PLAN_EXPERTISE_LEVELS:
+                expertise_level = "grandmaster"
+            plan = dict(_PLAN_TABLE[(expertise_level, stress_level > 4, focus_level < 2, time_to_exam < 30)])
+            plan["time_to_exam"] = time_to_exam
+            plan["adaptive_factors"] = {
+                "expertise_based": True,
+                "stress_considered": stress_level > 7,
+                "focus_optimized": focus_level < 4,
+                "exam_pressure": time_to_exam < 30
             }
+            return plan
 
         @tool
         async def route_student_message(message: str, session_context: Dict[str, Any]) -> Dict[str, str]:
             """Determine which agent to call based on student message"""
             
-            msg = message.lower()
+            categories = _route_categories(message)
             current_agent = session_context.get("current_agent")
             current_mode = session_context.get("current_mode", "learning")
             
             # Start command
-            if "start" in msg or "begin" in msg:
+            if "start" in categories:
                 return {
                     "agent": session_context.get("primary_agent", "teacher"),
                     "mode": session_context.get("initial_mode", "learning"),
@@ -214,7 +417,7 @@ class StudySessionOrchestrator:
             
             # Check for explicit agent switching keywords
             # Question keywords - switch to teacher
-            if any(word in msg for word in ["question", "practice", "test", "exam"]):
+            if "practice" in categories:
                 if current_agent != "teacher" or current_mode != "practice":
                     return {
                         "agent": "teacher",
@@ -232,7 +435,7 @@ class StudySessionOrchestrator:
                     }
             
             # Explanation keywords - switch to tutor (but respect stress-level agent selection)
-            if any(word in msg for word in ["explain", "understand", "confused", "help", "clarify"]):
+            if "explain" in categories:
                 # If student has high stress (primary agent is perfect_scorer), keep them with perfect_scorer
                 # for wellbeing-focused explanations instead of switching to tutor
                 if session_context.get("primary_agent") == "perfect_scorer":
@@ -268,7 +471,7 @@ class StudySessionOrchestrator:
                     }
             
             # Visual/memory keywords - switch to perfect_scorer
-            if any(word in msg for word in ["visual", "remember", "memorize", "diagram", "mind map", "mnemonic"]):
+            if "visual" in categories:
                 if current_agent != "perfect_scorer" or current_mode != "learning":
                     return {
                         "agent": "perfect_scorer",
@@ -371,15 +574,10 @@ class StudySessionOrchestrator:
         self.reassess_session_progress = reassess_session_progress
 
         # WORKING VERSION - Compatible with current Strands SDK
-        # Use BedrockModel with streaming explicitly disabled for inference profile models
-        from strands.models import BedrockModel
-        orchestrator_bedrock_model = BedrockModel(
-            model_id="us.anthropic.claude-sonnet-4-20250514-v1:0",
-            streaming=False  # CRITICAL: Inference profile models don't support ConverseStream
-        )
+        # Uses the shared non-streaming BedrockModel (inference profile models need streaming disabled)
         self.agent = Agent(
             tools=[analyze_student_profile, route_student_message, reassess_session_progress],
-            model=orchestrator_bedrock_model,
+            model=self.model,
             name="Study Orchestrator"
         )
 
@@ -395,53 +593,7 @@ class StudySessionOrchestrator:
         ) -> str:
             """Provide structured explanation of core concepts in digestible chunks"""
             
-            # This would integrate with your existing syllabus content
-            explanations = {
-                "kinematics": """Let me explain kinematics step by step:
-
-1. **What is Kinematics?**
-   Kinematics is the study of motion without considering the forces that cause it.
-
-2. **Key Concepts:**
-   - Displacement (s): Change in position
-   - Velocity (v): Rate of change of displacement
-   - Acceleration (a): Rate of change of velocity
-
-3. **Essential Equations:**
-   - v = u + at
-   - s = ut + ½at²
-   - v² = u² + 2as
-
-Let's start with displacement. Can you think of an example where you moved from one position to another?""",
-                
-                "reading_comprehension": """Reading Comprehension involves three key skills:
-
-1. **Literal Comprehension**: What the text directly states
-2. **Inferential Comprehension**: What the text implies
-3. **Critical Analysis**: Author's purpose and techniques
-
-For O-Level success, focus on:
-- Identifying main ideas vs supporting details
-- Understanding context clues for vocabulary
-- Recognizing author's tone and purpose
-
-Would you like to practice with a sample passage?""",
-                
-                "algebra": """Algebraic problem-solving follows these steps:
-
-1. **Identify** what you're solving for
-2. **Set up** the equation using given information
-3. **Solve** systematically using algebraic rules
-4. **Check** your answer makes sense
-
-For linear equations: ax + b = c
-- Isolate the variable by undoing operations
-- Work backwards from the equals sign
-
-Ready to try a practice problem?"""
-            }
-            
-            return explanations.get(topic, f"Structured explanation for {topic} topic coming up...")
+            return _EXPLANATIONS.get(topic, f"Structured explanation for {topic} topic coming up...")
 
         @tool
         def generate_practice_question(
@@ -451,35 +603,14 @@ Ready to try a practice problem?"""
         ) -> Dict[str, str]:
             """Generate Singapore O-Level style practice questions"""
             
-            questions = {
-                "kinematics": {
-                    "beginner": {
-                        "question": "A car travels 60 meters in 12 seconds at constant velocity. Calculate the car's velocity.",
-                        "answer": "5 m/s",
-                        "working": "v = s/t = 60m ÷ 12s = 5 m/s",
-                        "technique": "Always identify what's given and what you need to find. Use the appropriate kinematic equation."
-                    },
-                    "apprentice": {
-                        "question": "A ball is dropped from rest and falls for 3.0 seconds. Calculate: (a) its final velocity (b) the distance fallen. (g = 9.81 m/s²)",
-                        "answer": "(a) 29.4 m/s (b) 44.1 m",
-                        "working": "(a) v = u + at = 0 + 9.81(3) = 29.4 m/s\n(b) s = ut + ½at² = 0 + ½(9.81)(3²) = 44.1 m",
-                        "technique": "For free fall: u = 0, a = g. Use appropriate equations for each part."
-                    }
-                },
-                "reading_comprehension": {
-                    "beginner": {
-                        "question": "Read this passage and answer: 'The expedition failed due to unexpected weather conditions.' What was the primary reason for failure?",
-                        "answer": "Unexpected weather conditions",
-                        "technique": "Look for explicit statements. The answer is directly stated in the text."
-                    }
-                }
-            }
-            
-            return questions.get(topic, {}).get(expertise_level, {
+            question = _PRACTICE_QUESTIONS.get(topic, {}).get(expertise_level)
+            if question is not None:
+                return dict(question)
+            return {
                 "question": f"O-Level style {topic} question for {expertise_level} level",
                 "answer": "Sample answer",
                 "technique": "Standard O-Level answering approach"
-            })
+            }
 
         # ORIGINAL TEACHER AGENT CODE - COMMENTED OUT DUE TO STRANDS SDK COMPATIBILITY
         # @Agent  
@@ -505,15 +636,15 @@ Ready to try a practice problem?"""
         #         self.explain_concept = explain_concept
         #         self.generate_practice_question = generate_practice_question
         # 
-        # self.specialized_agents["teacher"] = TeacherAgent()
+        # self._register_specialized_agent("teacher", TeacherAgent)
 
         # WORKING VERSION - Compatible with current Strands SDK
-        # Pass model string directly (same as optimized_evaluation.py)
-        self.specialized_agents["teacher"] = Agent(
+        # Share the orchestrator's BedrockModel instead of building a new client per agent
+        self._register_specialized_agent("teacher", lambda: Agent(
             tools=[explain_concept, generate_practice_question],
-            model="us.anthropic.claude-sonnet-4-20250514-v1:0",
+            model=self.model,
             name="Teacher Agent"
-        )
+        ))
 
         # TUTOR AGENT  
         @tool
@@ -574,26 +705,14 @@ question short (one sentence). Make them encouraging and scaffolded.
         ) -> Dict[str, str]:
             """Provide detailed feedback with O-Level answering techniques"""
             
-            feedback = {
+            guidance = _FEEDBACK_GUIDANCE.get(topic, _DEFAULT_FEEDBACK_GUIDANCE)
+            return {
                 "analysis": f"Your answer: {student_answer}\nCorrect answer: {correct_answer}",
                 "explanation": "Let me explain the reasoning behind the correct answer...",
-                "technique": "For O-Level success, remember to:",
-                "keywords": "Key terms to include in your answer:",
+                "technique": guidance["technique"],
+                "keywords": guidance["keywords"],
                 "time_management": "Exam technique: Spend 2-3 minutes on questions like this."
             }
-            
-            if topic == "kinematics":
-                feedback.update({
-                    "technique": "1. Write down given values\n2. Identify what to find\n3. Choose appropriate equation\n4. Substitute and solve\n5. Check units and reasonableness",
-                    "keywords": "velocity, acceleration, displacement, time, equations of motion"
-                })
-            elif topic == "reading_comprehension": 
-                feedback.update({
-                    "technique": "1. Read question first\n2. Skim passage for relevant sections\n3. Quote directly when asked\n4. Explain inference with evidence\n5. Check word count if specified",
-                    "keywords": "according to the passage, the author suggests, this implies, evidence shows"
-                })
-            
-            return feedback
 
         # ORIGINAL TUTOR AGENT CODE - COMMENTED OUT DUE TO STRANDS SDK COMPATIBILITY
         # @Agent
@@ -620,15 +739,15 @@ question short (one sentence). Make them encouraging and scaffolded.
         #         self.ask_socratic_question = ask_socratic_question
         #         self.provide_detailed_feedback = provide_detailed_feedback
         # 
-        # self.specialized_agents["tutor"] = TutorAgent()
+        # self._register_specialized_agent("tutor", TutorAgent)
 
         # WORKING VERSION - Compatible with current Strands SDK
-        # Pass model string directly (same as optimized_evaluation.py)
-        self.specialized_agents["tutor"] = Agent(
+        # Share the orchestrator's BedrockModel instead of building a new client per agent
+        self._register_specialized_agent("tutor", lambda: Agent(
             tools=[ask_socratic_question, provide_detailed_feedback],
-            model="us.anthropic.claude-sonnet-4-20250514-v1:0",
+            model=self.model,
             name="Tutor Agent"
-        )
+        ))
 
         # PERFECT SCORER AGENT
         @tool  
@@ -639,54 +758,7 @@ question short (one sentence). Make them encouraging and scaffolded.
         ) -> Dict[str, str]:
             """Create visual learning aids including diagrams, mind maps, mnemonics"""
             
-            visual_aids = {
-                "kinematics": {
-                    "mind_map": """
-```mermaid
-mindmap
-  root((Kinematics))
-    Motion Concepts
-      Displacement (s)
-      Velocity (v) 
-      Acceleration (a)
-    Key Equations
-      v = u + at
-      s = ut + ½at²
-      v² = u² + 2as
-    Applications
-      Free Fall
-      Projectile Motion
-      Uniform Motion
-```""",
-                    "mnemonic": "**SUV-AT** - Remember the kinematic equations with 'SUV AT':\n- **S** = ut + ½at² (displacement)\n- **U** = initial velocity\n- **V** = final velocity  \n- **A** = acceleration\n- **T** = time",
-                    "diagram": "Velocity-Time Graph:\n↑ Velocity\n│   /\n│  /  ← slope = acceleration\n│ /\n│/\n└─────→ Time\nArea under curve = displacement"
-                },
-                "reading_comprehension": {
-                    "mind_map": """
-```mermaid
-mindmap
-  root((Reading Comprehension))
-    Question Types
-      Literal
-        Direct facts
-        Explicit information
-      Inferential  
-        Implied meaning
-        Context clues
-      Critical
-        Author's purpose
-        Tone analysis
-    Answering Strategy
-      Read questions first
-      Skim for keywords
-      Quote with evidence
-      Check word limits
-```""",
-                    "mnemonic": "**RICE** for Reading Comprehension:\n- **R**ead questions first\n- **I**dentify key information\n- **C**onnect evidence to answer\n- **E**xplain with quotes"
-                }
-            }
-            
-            aids = visual_aids.get(topic, {})
+            aids = _VISUAL_AIDS.get(topic, {})
             return {
                 "visual_aid": aids.get(aid_type, f"Visual aid for {concept}"),
                 "type": aid_type,
@@ -702,15 +774,9 @@ mindmap
         ) -> str:
             """Simulate peer study session for active recall"""
             
-            peer_prompts = {
-                "kinematics": "Pretend I'm your study buddy who's confused about acceleration. Explain to me the difference between velocity and acceleration using a real-world example.",
-                "reading_comprehension": "I'm struggling with inference questions. Explain to me how you identify what the author is implying without directly stating.",
-                "algebra": "Walk me through your problem-solving approach. How do you decide which method to use for different equation types?"
-            }
-            
             return f"""🎓 **Peer Study Mode Activated**
 
-{peer_prompts.get(topic, f"Explain {concept} to me as if I'm your study partner.")}
+{_PEER_PROMPTS.get(topic, f"Explain {concept} to me as if I'm your study partner.")}
 
 Remember: Teaching others is the best way to test your own understanding!
 
@@ -779,15 +845,32 @@ After you explain, I'll give you feedback on your explanation and we can discuss
         #         self.simulate_peer_study = simulate_peer_study
         #         self.check_wellbeing = check_wellbeing
         # 
-        # self.specialized_agents["perfect_scorer"] = PerfectScorerAgent()
+        # self._register_specialized_agent("perfect_scorer", PerfectScorerAgent)
 
         # WORKING VERSION - Compatible with current Strands SDK
-        # Pass model string directly (same as optimized_evaluation.py)
-        self.specialized_agents["perfect_scorer"] = Agent(
+        # Share the orchestrator's BedrockModel instead of building a new client per agent
+        self._register_specialized_agent("perfect_scorer", lambda: Agent(
             tools=[create_visual_aid, simulate_peer_study, check_wellbeing],
-            model="us.anthropic.claude-sonnet-4-20250514-v1:0",
+            model=self.model,
             name="Perfect Scorer Agent"
-        )
+        ))
+
+    @property
+    def specialized_agents(self) -> Mapping[str, Callable[[], Any]]:
+        """Read-only view of the registered specialized roles and their agent factories"""
+        return MappingProxyType(self._agent_factories)
+
+    def _register_specialized_agent(self, agent_id: str, factory) -> None:
+        """Register how to build a specialized role's agent; agents are created per session on first use"""
+        self._agent_factories[agent_id] = factory
+
+    def _get_session_agent(self, session_id: str, agent_id: str):
+        """The session's own agent for a role, created the first time the session calls it"""
+        agents = self._session_agents.setdefault(session_id, {})
+        agent = agents.get(agent_id)
+        if agent is None:
+            agent = agents[agent_id] = self._agent_factories[agent_id]()
+        return agent
 
     async def initialize_session(self, context: SessionContext) -> SessionData:
         """Initialize a new study session with orchestrator analysis"""
@@ -807,7 +890,7 @@ After you explain, I'll give you feedback on your explanation and we can discuss
         if STRANDS_AVAILABLE and self.agent:
             try:
                 # Use orchestrator's analysis tool
-                plan_data = await self.analyze_student_profile(
+                plan_data = self.analyze_student_profile(
                     expertise_level=context.expertise_level,
                     focus_level=context.focus_level,
                     stress_level=context.stress_level,
@@ -920,7 +1003,7 @@ Ready to begin? Type 'start' or ask any questions about the topic!"""
             try:
                 # Get routing decision from orchestrator
                 session_context = {
-                    **asdict(session_data.session_plan),
+                    **session_data.session_plan.to_dict(),
                     "current_agent": session_data.current_agent,
                     "current_mode": session_data.current_mode
                 }
@@ -1026,11 +1109,11 @@ Ready to begin? Type 'start' or ask any questions about the topic!"""
 
         logger.info(f"🤖 Calling specialized agent: {agent_id} in {mode} mode")
 
-        if agent_id not in self.specialized_agents:
-            logger.error(f"❌ Agent {agent_id} not found in specialized_agents")
+        if agent_id not in self._agent_factories:
+            logger.error(f"❌ Agent {agent_id} not found in specialized agents")
             return {"error": f"Agent {agent_id} not found"}
 
-        agent = self.specialized_agents[agent_id]
+        agent = self._get_session_agent(session_data.session_id, agent_id)
         context = session_data.context
 
         logger.info(f"📋 Agent context: topic={context.topic_id}, expertise={context.expertise_level}")
@@ -1278,6 +1361,7 @@ DO NOT mention "content generation" or assume they want you to create materials.
         
         # Clean up session
         del self.active_sessions[session_id]
+        self._session_agents.pop(session_id, None)
         
         return {
             "success": True,
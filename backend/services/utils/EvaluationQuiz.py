@@ -1,17 +1,198 @@
 import json
 import asyncio
+import copy
+import functools
+import operator
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, TypedDict
 from dataclasses import dataclass
+from types import MappingProxyType
 from strands import Agent, tool
 from strands_tools import http_request
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging level is configured by the entry point (see __main__ below)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# orjson serializes the quiz payload much faster; fall back to the stdlib encoder without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Syllabus content is static per (syllabus, topic), so RAG responses are kept across runs
+_SYLLABUS_CACHE_PATH = Path.home() / '.cache' / 'nurture' / 'syllabus.json'
+
+# Most recent quiz payloads kept for repeat topic selections
+_QUIZ_CACHE_SIZE = 128
+
+# Question generation request rate (requests per second), overridable per deployment
+_QUIZGEN_RPS = float(os.getenv('QUIZGEN_RPS', '5'))
+
+# Upper bound on concurrent syllabus fetches, to stay within provider rate limits
+_SYLLABUS_FETCH_CONCURRENCY = 8
+
+# The question section runs from the first "**Question:**" to the answer/solution (or another question)
+_QUESTION_MARKER = '**Question:**'
+_QUESTION_END_MARKERS = ('**Question:**', '**Correct Answer:**', '**Solution:**')
+
+# Difficulty progression (9 questions per topic), flattened to (level, type, index) once at import
+_DIFFICULTY_CONFIG = (
+    ('easy', 2, 'mcq'),
+    ('medium', 3, 'structured'),
+    ('hard', 3, 'structured'),
+    ('very_hard', 1, 'structured_explanation'),
+)
+_DIFFICULTY_EXPANSION = tuple(
+    (level, question_type, i + 1)
+    for level, count, question_type in _DIFFICULTY_CONFIG
+    for i in range(count)
+)
+
+# Invariant instructions come first so repeated prompts share the longest possible prefix
+_QUESTION_PROMPT_PREFIX = """Generate a concise question of the difficulty and type given below.
+
+Format: Question text + options (if MCQ) + correct answer.
+Keep it focused on Singapore O-Level standards.
+"""
+
+def _build_question_prompt(metadata: Dict[str, Any]) -> str:
+    """Question prompt with the per-question fields at the end"""
+    return (
+        f"{_QUESTION_PROMPT_PREFIX}\n"
+        f"Topic: '{metadata['topic']}' ({metadata['subject']})\n"
+        f"Difficulty: {metadata['difficulty']}\n"
+        f"Type: {metadata['type']}"
+    )
+
+# Persistent event loop behind the sync entry points, started on first use
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+def _enable_eager_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    """Start tasks eagerly on Python 3.12+, so ones that finish without blocking skip a loop round-trip"""
+    if sys.version_info >= (3, 12):
+        loop.set_task_factory(asyncio.eager_task_factory)
+
+def _run_sync(coro) -> Any:
+    """Run a coroutine on the shared background loop and block until it finishes"""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            _enable_eager_tasks(_background_loop)
+            threading.Thread(target=_background_loop.run_forever, name='evaluation-quiz-loop', daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop).result()
+
+# Retries run inside the event loop: only ever wait with asyncio.sleep here, never time.sleep,
+# which would stall every other in-flight question
+async def _aretry(coro_factory: Callable[[], Awaitable[Any]], *, max_tries: int = 3, base: float = 2,
+                  cap: float = 8, on_retry: Optional[Callable[[int, float, Exception], None]] = None) -> Any:
+    """Await coro_factory() until it succeeds, backing off exponentially (with jitter) between tries"""
+    for attempt in range(max_tries):
+        try:
+            return await coro_factory()
+        except Exception as e:
+            if attempt == max_tries - 1:  # Last attempt: no point sleeping before giving up
+                raise
+            delay = min(cap, base ** attempt)
+            delay += random.uniform(0, delay * 0.1)
+            if on_retry is not None:
+                on_retry(attempt + 1, delay, e)
+            await asyncio.sleep(delay)
+
+def to_json_bytes(quiz_data: Dict[str, Any], indent: bool = False) -> bytes:
+    """Serialize a quiz payload to UTF-8 JSON bytes"""
+    if 'start_time_ns' in quiz_data:
+        # The timestamp is kept as integer nanoseconds and only formatted on output
+        quiz_data = dict(quiz_data)
+        quiz_data['start_time'] = datetime.fromtimestamp(quiz_data.pop('start_time_ns') / 1e9).isoformat()
+    if orjson is not None:
+        return orjson.dumps(quiz_data, default=str, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(quiz_data, default=str, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(quiz_data, default=str, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _syllabus_cache_key(syllabus_code: str, topic: str) -> str:
+    """Normalized cache key for a syllabus/topic pair"""
+    return f"{syllabus_code}|{topic.strip().lower()}"
+
+# Question templates based on difficulty and subject, built once at import
+_QUESTION_TEMPLATES = MappingProxyType({
+    'Physics': {
+        'easy': {
+            'mcq': "What is the SI unit for velocity and which equation represents displacement?",
+            'options': ["m/s and s = ut + ½at²", "m/s² and v = u + at", "m and d = vt", "km/h and a = v/t"]
+        },
+        'medium': {
+            'structured': "A car accelerates from rest at 2 m/s² for 5 seconds. Calculate the final velocity and distance traveled."
+        },
+        'hard': {
+            'structured': "A projectile is launched at 30° to the horizontal with initial velocity 20 m/s. Find the maximum height and range."
+        },
+        'very_hard': {
+            'structured_explanation': "Analyze the motion of a ball thrown vertically upward, including energy transformations and real-world factors."
+        }
+    },
+    'Mathematics': {
+        'easy': {
+            'mcq': "Solve x + 5 = 12 and identify which method can solve x² - 5x + 6 = 0",
+            'options': ["x = 7; Factoring only", "x = 7; All algebraic methods", "x = 17; Quadratic formula only", "x = 5; Completing square only"]
+        },
+        'medium': {
+            'structured': "Solve the simultaneous equations: 2x + 3y = 7 and x - y = 1"
+        },
+        'hard': {
+            'structured': "A rectangular garden has perimeter 24m. If length is 2m more than width, find dimensions and area."
+        },
+        'very_hard': {
+            'structured_explanation': "Design a cost optimization problem involving quadratic functions and explain your mathematical reasoning."
+        }
+    },
+    'English': {
+        'easy': {
+            'mcq': "What does 'comprehension' mean and what is the main idea when the author's tone is optimistic?",
+            'options': ["Understanding; positive perspective on the topic", "Speed; negative view of events", "Writing; neutral stance", "Speaking; critical analysis"]
+        },
+        'medium': {
+            'structured': "Explain the difference between the author's explicit and implicit messages in the given passage."
+        },
+        'hard': {
+            'structured': "Analyze how the writer uses literary devices to convey the central theme."
+        },
+        'very_hard': {
+            'structured_explanation': "Critically evaluate the effectiveness of the writer's argument, considering evidence, reasoning, and potential counterarguments."
+        }
+    }
+})
+
+# Syllabus code -> subject key used by _QUESTION_TEMPLATES
+_TEMPLATE_SUBJECT_BY_SYLLABUS = MappingProxyType({'6091': 'Physics', '4048': 'Mathematics', '1128': 'English'})
+
+# Flattened lookups: (subject, difficulty, question_type) -> question text, (subject, difficulty) -> MCQ options
+_TEMPLATE_QUESTIONS = MappingProxyType({
+    (subject, difficulty, question_type): text
+    for subject, templates in _QUESTION_TEMPLATES.items()
+    for difficulty, template in templates.items()
+    for question_type, text in template.items()
+    if question_type != 'options'
+})
+_TEMPLATE_OPTIONS = MappingProxyType({
+    (subject, difficulty): tuple(template['options'])
+    for subject, templates in _QUESTION_TEMPLATES.items()
+    for difficulty, template in templates.items()
+    if 'options' in template
+})
+
+@dataclass(slots=True)
 class Subject:
     name: str
     syllabus: str
@@ -19,18 +200,101 @@ class Subject:
     topics: List[str]
     description: str
 
-@dataclass
-class Question:
+class Question(TypedDict):
+    """A quiz question as returned in the quiz payload"""
     id: str
     topic: str
     subject: str
     difficulty: str
     type: str
     question: str
-    options: Optional[List[str]]
+    options: Optional[Sequence[str]]
     correct_answer: str
     explanation: str
 
+# Placeholder MCQ choices for AI-generated questions, shared by every payload
+_MCQ_OPTIONS = ('Option A', 'Option B', 'Option C', 'Option D')
+_MCQ_ANSWER = 'Option A'
+
+# (options, correct_answer) placeholders by question type
+_MCQ_ANSWER_FIELDS = (_MCQ_OPTIONS, _MCQ_ANSWER)
+_STRUCTURED_ANSWER_FIELDS = (None, 'Structured answer')
+
+@functools.lru_cache(maxsize=64)
+def _ai_explanation(topic: str) -> str:
+    """Explanation text for an AI-generated question, built once per topic"""
+    return f"AI-generated explanation for {topic} question"
+
+_metadata_fields = operator.itemgetter('id', 'topic', 'subject', 'difficulty', 'type')
+
+def _question_payload(metadata: Dict[str, Any], question_text: Any) -> Question:
+    """Build the payload dict for one generated question"""
+    question_id, topic, subject, difficulty, question_type = _metadata_fields(metadata)
+    options, correct_answer = _MCQ_ANSWER_FIELDS if question_type == 'mcq' else _STRUCTURED_ANSWER_FIELDS
+    return Question(
+        id=question_id,
+        topic=topic,
+        subject=subject,
+        difficulty=difficulty,
+        type=question_type,
+        question=question_text,
+        options=options,
+        correct_answer=correct_answer,
+        explanation=_ai_explanation(topic)
+    )
+
+def _extract_question_text(result: Any) -> str:
+    """Pull the question text out of an agent result"""
+    # Extract text content from the AI response
+    if hasattr(result, 'message'):
+        if isinstance(result.message, dict) and 'content' in result.message:
+            question_text = result.message['content'][0]['text'] if result.message['content'] else str(result.message)
+        else:
+            question_text = str(result.message)
+    else:
+        question_text = str(result)
+    
+    # Clean up the question text to extract just the question part
+    marker_index = question_text.find(_QUESTION_MARKER)
+    if marker_index == -1:
+        return question_text
+    
+    # Extract the question part only, stopping at the earliest end marker
+    start = marker_index + len(_QUESTION_MARKER)
+    end = len(question_text)
+    for marker in _QUESTION_END_MARKERS:
+        position = question_text.find(marker, start, end)
+        if position != -1:
+            end = position
+    return question_text[start:end].strip()
+
+class AsyncRateLimiter:
+    """Token bucket pacing model calls at a steady rate, allowing short bursts"""
+    
+    def __init__(self, rate_per_sec: float, burst: float):
+        self.rate = rate_per_sec
+        self.burst = burst
+        self.tokens = burst  # Start full so the first calls go out immediately
+        self.updated = time.monotonic()
+        # Thread lock rather than asyncio.Lock: callers may run on different event loops,
+        # and the critical section never awaits
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take one token (possibly going into debt) and return how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+    
+    async def acquire(self):
+        """Wait until a request token is available"""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
 class EvaluationQuizAgent:
     def __init__(self):
         # Singapore official sources
@@ -69,14 +333,43 @@ class EvaluationQuizAgent:
             )
         ]
         
+        # Cached syllabus RAG responses, shared across quiz sessions
+        self._syllabus_cache = self._load_syllabus_cache()
+        # Held while a syllabus fetch uses the shared RAG agent
+        self._rag_agent_lock = asyncio.Lock()
+        
+        # Generated quiz payloads keyed by topic selection, least recently used first
+        self._quiz_cache = OrderedDict()
+        
         # Initialize agents
         self.setup_agents()
         
-        # Create agent pool for reuse
+        # Create agent pool for reuse; idle agents are checked out exclusively across concurrent quizzes
         self.agent_pool = []
+        self._idle_agents = asyncio.Queue()
         self.pool_size = 3  # Create 3 agents for concurrent use
         self._initialize_agent_pool()
+        
+        # Paces question calls at the provider's request rate
+        self.rate_limiter = AsyncRateLimiter(_QUIZGEN_RPS, burst=self.pool_size)
 
+    @property
+    def subjects(self) -> List[Subject]:
+        """Subjects offered in the quiz"""
+        return self._subjects
+    
+    @subjects.setter
+    def subjects(self, subjects: List[Subject]) -> None:
+        """Set the subject list and rebuild the topic indexes derived from it"""
+        self._subjects = subjects
+        # Topic -> subject index so lookups don't rescan every subject's topic list
+        self._topic_to_subject = {topic: subject for subject in subjects for topic in subject.topics}
+        self._template_subject_by_topic = {
+            topic: _TEMPLATE_SUBJECT_BY_SYLLABUS[subject.syllabus]
+            for topic, subject in self._topic_to_subject.items()
+            if subject.syllabus in _TEMPLATE_SUBJECT_BY_SYLLABUS
+        }
+    
     def _initialize_agent_pool(self):
         """Initialize a pool of reusable agents for question generation"""
         for i in range(self.pool_size):
@@ -85,19 +378,76 @@ class EvaluationQuizAgent:
                 model=self.model_id
             )
             self.agent_pool.append(agent)
-    
-    def _get_agent_from_pool(self, index: int) -> Agent:
-        """Get an agent from the pool based on index"""
-        return self.agent_pool[index % len(self.agent_pool)]
+            self._idle_agents.put_nowait(agent)
     
     def _reset_agent_conversation(self, agent: Agent):
-        """Reset agent conversation history if needed"""
-        # Clear conversation history to prevent accumulation
-        if hasattr(agent, '_conversation_history'):
-            agent._conversation_history = []
-        # Or if Strands has a different method to clear history
-        # agent.clear_history() # Check Strands documentation for actual method
+        """Reset agent conversation history so each question starts from a clean context"""
+        # Strands keeps the conversation in agent.messages
+        agent.messages.clear()
 
+    def _load_syllabus_cache(self) -> Dict[str, Any]:
+        """Load previously fetched syllabus content from disk"""
+        try:
+            with open(_SYLLABUS_CACHE_PATH, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_syllabus_cache(self, snapshot: Dict[str, Any]) -> None:
+        """Persist fetched syllabus content so warm starts skip the LLM"""
+        try:
+            _SYLLABUS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            # Write a temp file and swap it in, so a crash mid-write never leaves a truncated cache
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=_SYLLABUS_CACHE_PATH.parent,
+                                             prefix='syllabus.', suffix='.tmp', delete=False) as f:
+                json.dump(snapshot, f, default=str)
+            os.replace(f.name, _SYLLABUS_CACHE_PATH)
+        except OSError as e:
+            logger.warning(f"Failed to save syllabus cache: {e}")
+    
+    async def _fetch_syllabus_content(self, syllabus_code: str, topic: str, query: str) -> Any:
+        """Fetch syllabus content for one topic via the RAG agent, reusing cached content"""
+        cache_key = _syllabus_cache_key(syllabus_code, topic)
+        if cache_key in self._syllabus_cache:
+            logger.info("Using cached syllabus content for %s - %s", syllabus_code, topic)
+            return self._syllabus_cache[cache_key]
+        
+        # The shared RAG agent holds one conversation, so concurrent fetches get their own agent
+        if self._rag_agent_lock.locked():
+            result = await self._create_rag_agent().invoke_async(query)
+        else:
+            async with self._rag_agent_lock:
+                result = await self.rag_agent.invoke_async(query)
+        
+        self._syllabus_cache[cache_key] = result.message
+        return result.message
+    
+    def _syllabus_requests(self, selected_topics: List[str]) -> List[tuple]:
+        """One (syllabus_code, topic, query) fetch request per selected topic with a known subject"""
+        requests = []
+        for topic in selected_topics:
+            subject = self._topic_to_subject.get(topic)
+            if subject:
+                query = f"Retrieve detailed syllabus content for {topic} from Singapore O-Level {subject.name} syllabus {subject.syllabus}"
+                requests.append((subject.syllabus, topic, query))
+        return requests
+    
+    async def _gather_syllabus_content(self, requests: List[tuple]) -> List[Any]:
+        """Fetch (syllabus_code, topic, query) requests concurrently; failures are returned as exceptions"""
+        semaphore = asyncio.Semaphore(_SYLLABUS_FETCH_CONCURRENCY)
+        cached_before = len(self._syllabus_cache)
+        
+        async def fetch(syllabus_code: str, topic: str, query: str) -> Any:
+            async with semaphore:
+                return await self._fetch_syllabus_content(syllabus_code, topic, query)
+        
+        results = await asyncio.gather(*(fetch(*request) for request in requests), return_exceptions=True)
+        
+        # Save once per quiz, off the event loop, and only if anything new was fetched
+        if len(self._syllabus_cache) != cached_before:
+            await asyncio.to_thread(self._save_syllabus_cache, dict(self._syllabus_cache))
+        return results
+    
     def _get_fallback_content(self, syllabus_code: str, topic: str) -> str:
         """Fallback content when HTTP requests fail"""
         if syllabus_code == '6091' and 'Kinematics' in topic:
@@ -215,60 +565,13 @@ class EvaluationQuizAgent:
                 Dict: Generated question with all required fields
             """
             
-            # Question templates based on difficulty and subject
-            question_templates = {
-                'Physics': {
-                    'easy': {
-                        'mcq': "What is the SI unit for velocity and which equation represents displacement?",
-                        'options': ["m/s and s = ut + ½at²", "m/s² and v = u + at", "m and d = vt", "km/h and a = v/t"]
-                    },
-                    'medium': {
-                        'structured': "A car accelerates from rest at 2 m/s² for 5 seconds. Calculate the final velocity and distance traveled."
-                    },
-                    'hard': {
-                        'structured': "A projectile is launched at 30° to the horizontal with initial velocity 20 m/s. Find the maximum height and range."
-                    },
-                    'very_hard': {
-                        'structured_explanation': "Analyze the motion of a ball thrown vertically upward, including energy transformations and real-world factors."
-                    }
-                },
-                'Mathematics': {
-                    'easy': {
-                        'mcq': "Solve x + 5 = 12 and identify which method can solve x² - 5x + 6 = 0",
-                        'options': ["x = 7; Factoring only", "x = 7; All algebraic methods", "x = 17; Quadratic formula only", "x = 5; Completing square only"]
-                    },
-                    'medium': {
-                        'structured': "Solve the simultaneous equations: 2x + 3y = 7 and x - y = 1"
-                    },
-                    'hard': {
-                        'structured': "A rectangular garden has perimeter 24m. If length is 2m more than width, find dimensions and area."
-                    },
-                    'very_hard': {
-                        'structured_explanation': "Design a cost optimization problem involving quadratic functions and explain your mathematical reasoning."
-                    }
-                },
-                'English': {
-                    'easy': {
-                        'mcq': "What does 'comprehension' mean and what is the main idea when the author's tone is optimistic?",
-                        'options': ["Understanding; positive perspective on the topic", "Speed; negative view of events", "Writing; neutral stance", "Speaking; critical analysis"]
-                    },
-                    'medium': {
-                        'structured': "Explain the difference between the author's explicit and implicit messages in the given passage."
-                    },
-                    'hard': {
-                        'structured': "Analyze how the writer uses literary devices to convey the central theme."
-                    },
-                    'very_hard': {
-                        'structured_explanation': "Critically evaluate the effectiveness of the writer's argument, considering evidence, reasoning, and potential counterarguments."
-                    }
-                }
-            }
-            
-            # Determine subject from topic
-            subject = "Physics" if "Kinematics" in topic else "Mathematics" if "Algebra" in topic else "English"
+            # Determine subject from topic (keyword match only for free-form topics from the model)
+            subject = self._template_subject_by_topic.get(topic)
+            if subject is None:
+                subject = "Physics" if "Kinematics" in topic else "Mathematics" if "Algebra" in topic else "English"
             
             # Get appropriate template
-            template = question_templates.get(subject, {}).get(difficulty, {})
+            options = _TEMPLATE_OPTIONS.get((subject, difficulty))
             
             question_data = {
                 'id': f"{topic.replace(' ', '_').lower()}_{difficulty}_{question_type}",
@@ -276,17 +579,18 @@ class EvaluationQuizAgent:
                 'subject': subject,
                 'difficulty': difficulty,
                 'type': question_type,
-                'question': template.get(question_type, f"Sample {difficulty} question for {topic}"),
-                'options': template.get('options') if question_type == 'mcq' else None,
-                'correct_answer': template.get('options', ['Sample answer'])[0] if question_type == 'mcq' else "Sample structured answer",
+                'question': _TEMPLATE_QUESTIONS.get((subject, difficulty, question_type), f"Sample {difficulty} question for {topic}"),
+                'options': options if question_type == 'mcq' else None,
+                'correct_answer': (options[0] if options else 'Sample answer') if question_type == 'mcq' else "Sample structured answer",
                 'explanation': f"This {difficulty} question tests understanding of {topic} concepts from the Singapore O-Level {subject} syllabus."
             }
             
             return question_data
         
         # Main RAG Agent
+        self.rag_tools = [http_request, fetch_syllabus_content, generate_adaptive_questions]
         self.rag_agent = Agent(
-            tools=[http_request, fetch_syllabus_content, generate_adaptive_questions],
+            tools=self.rag_tools,
             model="anthropic.claude-sonnet-4-20250514-v1:0"  # Corrected model ID
         )
         
@@ -294,6 +598,13 @@ class EvaluationQuizAgent:
         self.model_id = "anthropic.claude-sonnet-4-20250514-v1:0"  # Corrected model ID
         self.agent_tools = [generate_adaptive_questions]
     
+    def _create_rag_agent(self) -> Agent:
+        """Create an extra RAG agent for syllabus fetches that run alongside the shared one"""
+        return Agent(
+            tools=self.rag_tools,
+            model=self.model_id
+        )
+    
     async def start_quiz_async(self, selected_topics: List[str]) -> Dict[str, Any]:
         """
         Async method to start quiz with agentic RAG integration
@@ -301,156 +612,61 @@ class EvaluationQuizAgent:
         if not selected_topics:
             raise ValueError("No topics selected")
         
+        # Same topic selection as a recent quiz: reuse its payload instead of regenerating
+        cache_key = tuple(selected_topics)
+        cached_quiz = self._quiz_cache.get(cache_key)
+        if cached_quiz is not None:
+            self._quiz_cache.move_to_end(cache_key)
+            logger.info("Using cached quiz for topics: %s", selected_topics)
+            quiz_data = copy.deepcopy(cached_quiz)
+            quiz_data['start_time_ns'] = time.time_ns()
+            return quiz_data
+        
         try:
             # Get selected syllabi
             selected_syllabi = self.get_selected_syllabi(selected_topics)
             
-            logger.info(f"Starting quiz for topics: {selected_topics}")
-            logger.info(f"Using syllabi: {selected_syllabi}")
+            logger.info("Starting quiz for topics: %s", selected_topics)
+            logger.info("Using syllabi: %s", selected_syllabi)
             
-            # Step 1: Retrieve syllabus content using RAG agent
+            # Step 1: Retrieve syllabus content using RAG agent, one call per topic not cached yet
+            syllabus_requests = self._syllabus_requests(selected_topics)
+            results = await self._gather_syllabus_content(syllabus_requests)
             syllabus_content = {}
-            for topic in selected_topics:
-                subject = self.get_subject_by_topic(topic)
-                if subject:
-                    content_query = f"Retrieve detailed syllabus content for {topic} from Singapore O-Level {subject.name} syllabus {subject.syllabus}"
-                    
-                    # Use the agent to fetch content
-                    result = await self.rag_agent.invoke_async(content_query)
-                    syllabus_content[topic] = result.message
+            for (_, topic, _), result in zip(syllabus_requests, results):
+                if isinstance(result, BaseException):
+                    raise result
+                syllabus_content[topic] = result
             
             # Step 2: Generate questions with ramped difficulty (PARALLEL OPTIMIZATION)
-            generated_questions = []
-            
-            # Define difficulty progression (9 questions total)
-            difficulty_config = [
-                {'level': 'easy', 'count': 2, 'type': 'mcq'},
-                {'level': 'medium', 'count': 3, 'type': 'structured'},
-                {'level': 'hard', 'count': 3, 'type': 'structured'},
-                {'level': 'very_hard', 'count': 1, 'type': 'structured_explanation'}
-            ]
-            
             # Collect question metadata for batch processing
-            question_metadata = []
+            question_metadata = self._build_question_metadata(selected_topics)
             
-            for topic in selected_topics:
-                topic_content = syllabus_content.get(topic, "")
-                
-                for diff_config in difficulty_config:
-                    for i in range(diff_config['count']):
-                        # Store metadata for agent pool batch processing
-                        question_metadata.append({
-                            'topic': topic,
-                            'difficulty': diff_config['level'],
-                            'type': diff_config['type'],
-                            'index': i + 1,
-                            'subject': self.get_subject_by_topic(topic).name
-                        })
-            
-            # RATE-LIMITED BATCHED EXECUTION: Generate questions in batches of 3
-            batch_size = 3
-            question_results = []
-            
-            logger.info(f"Generating {len(question_metadata)} questions in batches of {batch_size}...")
-            
-            for i in range(0, len(question_metadata), batch_size):
-                batch_metadata = question_metadata[i:i + batch_size]
-                logger.info(f"Processing batch {i//batch_size + 1}/{(len(question_metadata) + batch_size - 1)//batch_size} ({len(batch_metadata)} questions)")
-                
-                # Function to create new tasks for this batch using agent pool
-                def create_batch_tasks():
-                    batch_tasks = []
-                    for idx, metadata in enumerate(batch_metadata):
-                        question_prompt = f"""
-                        Generate a concise {metadata['difficulty']} difficulty {metadata['type']} question for '{metadata['topic']}' ({metadata['subject']}).
-                        
-                        Format: Question text + options (if MCQ) + correct answer.
-                        Keep it focused on Singapore O-Level standards.
-                        Difficulty: {metadata['difficulty']}
-                        """
-                        # Use agent from pool instead of creating fresh ones
-                        agent_index = idx % len(self.agent_pool)
-                        agent = self._get_agent_from_pool(agent_index)
-                        
-                        # Reset conversation history to prevent accumulation
-                        self._reset_agent_conversation(agent)
-                        
-                        task = agent.invoke_async(question_prompt)
-                        batch_tasks.append(task)
-                    return batch_tasks
-                
-                try:
-                    batch_tasks = create_batch_tasks()
-                    batch_results = await asyncio.gather(*batch_tasks)
-                    question_results.extend(batch_results)
-                    
-                    # Add delay between batches to prevent rate limiting
-                    if i + batch_size < len(question_metadata):
-                        await asyncio.sleep(2)  # 2 second delay between batches
-                        
-                except Exception as e:
-                    logger.error(f"Batch failed, retrying with exponential backoff: {e}")
-                    # Exponential backoff retry for failed batch
-                    for retry in range(3):
-                        wait_time = 2 ** retry  # 2, 4, 8 seconds
-                        logger.info(f"Retrying batch after {wait_time} seconds (attempt {retry + 1}/3)")
-                        await asyncio.sleep(wait_time)
-                        
-                        try:
-                            # Create NEW tasks for retry (can't reuse awaited coroutines)
-                            retry_batch_tasks = create_batch_tasks()
-                            batch_results = await asyncio.gather(*retry_batch_tasks)
-                            question_results.extend(batch_results)
-                            break
-                        except Exception as retry_error:
-                            if retry == 2:  # Last attempt
-                                logger.error(f"Batch failed after all retries: {retry_error}")
-                                raise
-                            continue
-            
-            # Process results into Question objects
-            for result, metadata in zip(question_results, question_metadata):
-                # Extract text content from the AI response
-                if hasattr(result, 'message'):
-                    if isinstance(result.message, dict) and 'content' in result.message:
-                        question_text = result.message['content'][0]['text'] if result.message['content'] else str(result.message)
-                    else:
-                        question_text = str(result.message)
-                else:
-                    question_text = str(result)
-                
-                # Clean up the question text to extract just the question part
-                if '**Question:**' in question_text:
-                    # Extract the question part only
-                    parts = question_text.split('**Question:**')
-                    if len(parts) > 1:
-                        question_part = parts[1].split('**Correct Answer:**')[0].split('**Solution:**')[0].strip()
-                        question_text = question_part
-                
-                question = Question(
-                    id=f"{metadata['topic']}_{metadata['difficulty']}_{metadata['index']}",
-                    topic=metadata['topic'],
-                    subject=metadata['subject'],
-                    difficulty=metadata['difficulty'],
-                    type=metadata['type'],
-                    question=question_text,
-                    options=['Option A', 'Option B', 'Option C', 'Option D'] if metadata['type'] == 'mcq' else None,
-                    correct_answer='Option A' if metadata['type'] == 'mcq' else 'Structured answer',
-                    explanation=f"AI-generated explanation for {metadata['topic']} question"
-                )
-                generated_questions.append(question)
+            # Generate all questions concurrently; the agent pool bounds how many calls are in flight
+            logger.info("Generating %d questions with %d pooled agents...", len(question_metadata), len(self.agent_pool))
+            question_results = await self._generate_questions(question_metadata)
+            
+            # Process results into question payloads
+            generated_questions = [
+                _question_payload(metadata, _extract_question_text(result))
+                for result, metadata in zip(question_results, question_metadata)
+            ]
             
             # Prepare quiz session data
             quiz_data = {
-                'questions': [q.__dict__ for q in generated_questions],
+                'questions': generated_questions,
                 'topics': selected_topics,
                 'syllabi': selected_syllabi,
-                'start_time': datetime.now().isoformat(),
+                'start_time_ns': time.time_ns(),
                 'syllabus_content': syllabus_content,
                 'total_questions': len(generated_questions)
             }
             
-            logger.info(f"Generated {len(generated_questions)} questions for quiz session")
+            self._quiz_cache[cache_key] = copy.deepcopy(quiz_data)
+            if len(self._quiz_cache) > _QUIZ_CACHE_SIZE:
+                self._quiz_cache.popitem(last=False)
+            
+            logger.info("Generated %d questions for quiz session", len(generated_questions))
             return quiz_data
             
         except Exception as e:
@@ -461,13 +677,13 @@ class EvaluationQuizAgent:
         """
         Synchronous wrapper for starting quiz
         """
-        return asyncio.run(self.start_quiz_async(selected_topics))
+        return _run_sync(self.start_quiz_async(selected_topics))
     
     def start_quiz_with_progress(self, selected_topics: List[str], session_id: str, progress_store: dict) -> Dict[str, Any]:
         """
         Synchronous wrapper for starting quiz with progress tracking
         """
-        return asyncio.run(self.start_quiz_async_with_progress(selected_topics, session_id, progress_store))
+        return _run_sync(self.start_quiz_async_with_progress(selected_topics, session_id, progress_store))
     
     async def start_quiz_async_with_progress(self, selected_topics: List[str], session_id: str, progress_store: dict) -> Dict[str, Any]:
         """
@@ -479,7 +695,9 @@ class EvaluationQuizAgent:
                 'status': 'initializing',
                 'message': 'Setting up quiz parameters...',
                 'current_batch': 0,
-                'total_batches': 3
+                'total_batches': 3,
+                'completed_questions': 0,
+                'partial_questions': []
             })
             
             # Use the existing quiz generation logic but with progress updates
@@ -489,50 +707,28 @@ class EvaluationQuizAgent:
             # Get selected syllabi
             selected_syllabi = []
             for topic in selected_topics:
-                subject = self.get_subject_by_topic(topic)
+                subject = self._topic_to_subject.get(topic)
                 if subject:
                     selected_syllabi.append(subject.syllabus)
             
-            # Fetch syllabus content
+            # Fetch syllabus content (all topics concurrently)
+            syllabus_requests = self._syllabus_requests(selected_topics)
+            results = await self._gather_syllabus_content(syllabus_requests)
+            
             syllabus_content = {}
-            for syllabus in set(selected_syllabi):
-                try:
-                    content_result = await self.rag_agent.invoke_async(f"fetch_syllabus_content('{syllabus}')")
-                    syllabus_content[syllabus] = content_result.message
-                except Exception as e:
-                    logger.warning(f"Failed to fetch syllabus {syllabus}: {e}")
-                    syllabus_content[syllabus] = ""
-            
-            # Question distribution configuration (9 questions total)
-            difficulty_config = [
-                {'level': 'easy', 'count': 2, 'type': 'mcq'},
-                {'level': 'medium', 'count': 3, 'type': 'structured'},
-                {'level': 'hard', 'count': 3, 'type': 'structured'},
-                {'level': 'very_hard', 'count': 1, 'type': 'structured_explanation'}
-            ]
+            for (syllabus, topic, _), result in zip(syllabus_requests, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Failed to fetch syllabus {syllabus} - {topic}: {result}")
+                    result = ""
+                elif isinstance(result, BaseException):
+                    raise result
+                syllabus_content[topic] = result
             
             # Collect question metadata for batch processing
-            question_metadata = []
+            question_metadata = self._build_question_metadata(selected_topics)
             
-            for topic in selected_topics:
-                topic_content = syllabus_content.get(topic, "")
-                
-                for diff_config in difficulty_config:
-                    for i in range(diff_config['count']):
-                        # Store metadata for agent pool batch processing
-                        question_metadata.append({
-                            'topic': topic,
-                            'difficulty': diff_config['level'],
-                            'type': diff_config['type'],
-                            'index': i + 1,
-                            'subject': self.get_subject_by_topic(topic).name
-                        })
-            
-            # RATE-LIMITED BATCHED EXECUTION: Generate questions in batches of 3
-            batch_size = 3
-            question_results = []
-            
-            total_batches = (len(question_metadata) + batch_size - 1) // batch_size
+            # Progress is reported per question, so each question counts as one "batch" for the client
+            total_batches = len(question_metadata)
             
             # Update progress with correct total batches
             progress_store[session_id].update({
@@ -541,80 +737,9 @@ class EvaluationQuizAgent:
                 'total_batches': total_batches
             })
             
-            logger.info(f"Generating {len(question_metadata)} questions in batches of {batch_size}...")
-            
-            for i in range(0, len(question_metadata), batch_size):
-                batch_metadata = question_metadata[i:i + batch_size]
-                current_batch = i//batch_size + 1
-                
-                # Update progress for current batch
-                progress_store[session_id].update({
-                    'current_batch': current_batch,
-                    'message': f'Processing batch {current_batch}/{total_batches} ({len(batch_metadata)} questions)...'
-                })
-                
-                logger.info(f"Processing batch {current_batch}/{total_batches} ({len(batch_metadata)} questions)")
-                
-                # Function to create new tasks for this batch using agent pool
-                def create_batch_tasks():
-                    batch_tasks = []
-                    for idx, metadata in enumerate(batch_metadata):
-                        question_prompt = f"""
-                        Generate a concise {metadata['difficulty']} difficulty {metadata['type']} question for '{metadata['topic']}' ({metadata['subject']}).
-                        
-                        Format: Question text + options (if MCQ) + correct answer.
-                        Keep it focused on Singapore O-Level standards.
-                        Difficulty: {metadata['difficulty']}
-                        """
-                        # Use agent from pool instead of creating fresh ones
-                        agent_index = idx % len(self.agent_pool)
-                        agent = self._get_agent_from_pool(agent_index)
-                        
-                        # Reset conversation history to prevent accumulation
-                        self._reset_agent_conversation(agent)
-                        
-                        task = agent.invoke_async(question_prompt)
-                        batch_tasks.append(task)
-                    return batch_tasks
-                
-                try:
-                    batch_tasks = create_batch_tasks()
-                    batch_results = await asyncio.gather(*batch_tasks)
-                    question_results.extend(batch_results)
-                    
-                    # Update progress after successful batch
-                    progress_store[session_id].update({
-                        'message': f'Completed batch {current_batch}/{total_batches}'
-                    })
-                    
-                    # Add delay between batches to prevent rate limiting
-                    if i + batch_size < len(question_metadata):
-                        await asyncio.sleep(2)  # 2 second delay between batches
-                        
-                except Exception as e:
-                    logger.error(f"Batch failed, retrying with exponential backoff: {e}")
-                    # Exponential backoff retry for failed batch
-                    for retry in range(3):
-                        wait_time = 2 ** retry  # 2, 4, 8 seconds
-                        logger.info(f"Retrying batch after {wait_time} seconds (attempt {retry + 1}/3)")
-                        
-                        progress_store[session_id].update({
-                            'message': f'Retrying batch {current_batch}/{total_batches} (attempt {retry + 1}/3)...'
-                        })
-                        
-                        await asyncio.sleep(wait_time)
-                        
-                        try:
-                            # Create NEW tasks for retry (can't reuse awaited coroutines)
-                            retry_batch_tasks = create_batch_tasks()
-                            batch_results = await asyncio.gather(*retry_batch_tasks)
-                            question_results.extend(batch_results)
-                            break
-                        except Exception as retry_error:
-                            if retry == 2:  # Last attempt
-                                logger.error(f"Batch failed after all retries: {retry_error}")
-                                raise
-                            continue
+            # Generate all questions concurrently; the agent pool bounds how many calls are in flight
+            logger.info("Generating %d questions with %d pooled agents...", len(question_metadata), len(self.agent_pool))
+            question_results = await self._generate_questions(question_metadata, progress_store[session_id])
             
             # Update progress for final processing
             progress_store[session_id].update({
@@ -623,33 +748,23 @@ class EvaluationQuizAgent:
                 'current_batch': total_batches
             })
             
-            # Process results into Question objects
-            generated_questions = []
-            for result, metadata in zip(question_results, question_metadata):
-                question = Question(
-                    id=f"{metadata['topic']}_{metadata['difficulty']}_{metadata['index']}",
-                    topic=metadata['topic'],
-                    subject=metadata['subject'],
-                    difficulty=metadata['difficulty'],
-                    type=metadata['type'],
-                    question=result.message,
-                    options=['Option A', 'Option B', 'Option C', 'Option D'] if metadata['type'] == 'mcq' else None,
-                    correct_answer='Option A' if metadata['type'] == 'mcq' else 'Structured answer',
-                    explanation=f"AI-generated explanation for {metadata['topic']} question"
-                )
-                generated_questions.append(question)
+            # Build the question payloads directly from the results
+            generated_questions = [
+                _question_payload(metadata, result.message)
+                for result, metadata in zip(question_results, question_metadata)
+            ]
             
             # Prepare quiz session data
             quiz_data = {
-                'questions': [q.__dict__ for q in generated_questions],
+                'questions': generated_questions,
                 'topics': selected_topics,
                 'syllabi': selected_syllabi,
-                'start_time': datetime.now().isoformat(),
+                'start_time_ns': time.time_ns(),
                 'syllabus_content': syllabus_content,
                 'total_questions': len(generated_questions)
             }
             
-            logger.info(f"Generated {len(generated_questions)} questions for quiz session")
+            logger.info("Generated %d questions for quiz session", len(generated_questions))
             return quiz_data
             
         except Exception as e:
@@ -662,21 +777,84 @@ class EvaluationQuizAgent:
                 })
             raise
     
+    async def _generate_questions(self, question_metadata: List[Dict[str, Any]], progress: Optional[dict] = None) -> List[Any]:
+        """Generate every question concurrently, one pooled agent per in-flight call.
+        
+        Results are returned in metadata order. With a progress dict, each question is
+        published to it as soon as its call completes.
+        """
+        async def generate(position: int, metadata: Dict[str, Any]):
+            question_prompt = _build_question_prompt(metadata)
+            
+            async def invoke():
+                agent = await self._idle_agents.get()
+                try:
+                    # Reset conversation history to prevent accumulation
+                    self._reset_agent_conversation(agent)
+                    await self.rate_limiter.acquire()
+                    return await agent.invoke_async(question_prompt)
+                finally:
+                    self._idle_agents.put_nowait(agent)
+            
+            def on_retry(attempt: int, delay: float, error: Exception):
+                logger.error("Question %s failed, retrying with exponential backoff: %s", metadata['id'], error)
+                logger.info("Retrying question %s after %.1f seconds (attempt %d/3)", metadata['id'], delay, attempt)
+                if progress is not None:
+                    progress['message'] = f"Retrying question {position + 1}/{len(question_metadata)} (attempt {attempt}/3)..."
+            
+            try:
+                return position, await _aretry(invoke, max_tries=4, on_retry=on_retry)
+            except Exception as e:
+                logger.error("Question %s failed after all retries: %s", metadata['id'], e)
+                raise
+        
+        results = [None] * len(question_metadata)
+        pending = [asyncio.ensure_future(generate(position, metadata)) for position, metadata in enumerate(question_metadata)]
+        try:
+            for next_done in asyncio.as_completed(pending):
+                position, result = await next_done
+                results[position] = result
+                if progress is not None:
+                    progress['partial_questions'].append(_question_payload(question_metadata[position], result.message))
+                    completed = progress['completed_questions'] + 1
+                    progress.update({
+                        'completed_questions': completed,
+                        'current_batch': completed,
+                        'message': f"Generated {completed}/{len(question_metadata)} questions"
+                    })
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+        
+        return results
+    
+    def _build_question_metadata(self, selected_topics: List[str]) -> List[Dict[str, Any]]:
+        """Metadata for every question in the quiz, including its payload id"""
+        return [
+            {
+                'id': f"{topic}_{level}_{index}",
+                'topic': topic,
+                'difficulty': level,
+                'type': question_type,
+                'index': index,
+                'subject': self._topic_to_subject[topic].name
+            }
+            for topic in selected_topics
+            for level, question_type, index in _DIFFICULTY_EXPANSION
+        ]
+    
     def get_subject_by_topic(self, topic: str) -> Optional[Subject]:
         """Find subject that contains the given topic"""
-        for subject in self.subjects:
-            if topic in subject.topics:
-                return subject
-        return None
+        return self._topic_to_subject.get(topic)
     
     def get_selected_syllabi(self, selected_topics: List[str]) -> List[str]:
         """Get unique syllabi codes for selected topics"""
-        unique_syllabi = set()
-        for topic in selected_topics:
-            subject = self.get_subject_by_topic(topic)
-            if subject:
-                unique_syllabi.add(subject.syllabus)
-        return list(unique_syllabi)
+        return list({
+            self._topic_to_subject[topic].syllabus
+            for topic in selected_topics
+            if topic in self._topic_to_subject
+        })
     
     def display_subject_selection(self) -> None:
         """Display available subjects and topics for selection"""
@@ -720,6 +898,7 @@ class EvaluationQuizAgent:
 # Main execution
 async def main():
     """Main function to run the evaluation quiz system"""
+    _enable_eager_tasks(asyncio.get_running_loop())
     quiz_system = EvaluationQuizAgent()
     
     # Interactive topic selection
@@ -736,10 +915,13 @@ async def main():
         # Generate quiz using agentic RAG system
         quiz_data = await quiz_system.start_quiz_async(selected_topics)
         
+        topics_str = ', '.join(quiz_data['topics'])
+        syllabi_str = ', '.join(quiz_data['syllabi'])
+        
         print(f"\n✅ Quiz generated successfully!")
         print(f"📊 Total questions: {quiz_data['total_questions']}")
-        print(f"📚 Topics covered: {', '.join(quiz_data['topics'])}")
-        print(f"📋 Syllabi: {', '.join(quiz_data['syllabi'])}")
+        print(f"📚 Topics covered: {topics_str}")
+        print(f"📋 Syllabi: {syllabi_str}")
         
         # Display sample questions
         print("\n📝 Sample Questions:")
@@ -750,8 +932,8 @@ async def main():
                     print(f"   {chr(64+j)}. {option}")
         
         # Save quiz data
-        with open('quiz_session.json', 'w') as f:
-            json.dump(quiz_data, f, indent=2)
+        with open('quiz_session.json', 'wb') as f:
+            f.write(to_json_bytes(quiz_data, indent=True))
         
         print(f"\n💾 Quiz data saved to 'quiz_session.json'")
         print("🎯 Ready to begin assessment!")
@@ -760,5 +942,6 @@ async def main():
         print(f"❌ Failed to generate quiz: {str(e)}")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     # Run the async main function
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test the generated question cache in the quiz generation service
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+pytest.importorskip('boto3')
+pytest.importorskip('strands')
+pytest.importorskip('strands_tools')
+
+from services.agentic import quiz_generation
+from services.agentic.quiz_generation import QuestionCache
+
+SLOT = ('Kinematics', 'easy', 'mcq', 1)
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable stand-in for the module's monotonic clock"""
+    now = [1000.0]
+    monkeypatch.setattr(quiz_generation, '_monotonic', lambda: now[0])
+    return now
+
+def test_miss_then_hit(clock):
+    """A stored question is returned for its key; other keys miss"""
+    cache = QuestionCache()
+    key = cache.next_key(SLOT)
+    assert cache.get(key) is None
+    cache.put(key, 'question text')
+    assert cache.get(key) == 'question text'
+    assert cache.get(('Kinematics', 'hard', 'structured', 1, 0)) is None
+
+def test_expired_entries_are_dropped(clock):
+    """Entries older than the TTL miss and are removed"""
+    cache = QuestionCache(ttl=60)
+    key = cache.next_key(SLOT)
+    cache.put(key, 'question text')
+    clock[0] += 61
+    assert cache.get(key) is None
+    assert key not in cache._entries
+
+def test_least_recently_used_entry_is_evicted(clock):
+    """Past maxsize, the least recently used entry goes first"""
+    cache = QuestionCache(maxsize=2)
+    cache.put(('a', 'easy', 'mcq', 1, 0), 'a')
+    cache.put(('b', 'easy', 'mcq', 1, 0), 'b')
+    cache.get(('a', 'easy', 'mcq', 1, 0))
+    cache.put(('c', 'easy', 'mcq', 1, 0), 'c')
+    assert cache.get(('b', 'easy', 'mcq', 1, 0)) is None
+    assert cache.get(('a', 'easy', 'mcq', 1, 0)) == 'a'
+    assert cache.get(('c', 'easy', 'mcq', 1, 0)) == 'c'
+
+def test_repeat_quizzes_rotate_through_variants(clock):
+    """Successive quizzes get different variants of a slot, wrapping after `variants` runs"""
+    cache = QuestionCache(variants=3)
+    keys = [cache.next_key(SLOT) for _ in range(4)]
+    assert keys[:3] == [(*SLOT, 0), (*SLOT, 1), (*SLOT, 2)]
+    assert keys[3] == keys[0]
+
+    cache.put(keys[0], 'first variant')
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[3]) == 'first variant'
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-v']))
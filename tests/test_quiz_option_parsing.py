@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test MCQ option parsing in the quiz generation service
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+pytest.importorskip('boto3')
+pytest.importorskip('strands')
+pytest.importorskip('strands_tools')
+
+from services.agentic.quiz_generation import EvaluationQuizAgent
+
+def parse(text, question_type='mcq'):
+    """Run parse_structured_question without setting up agents"""
+    agent = EvaluationQuizAgent.__new__(EvaluationQuizAgent)
+    return agent.parse_structured_question(text, question_type)
+
+def test_numbered_stem_lines_are_not_options():
+    """Numbered lines outside the options block must not be picked up as options"""
+    text = (
+        "Question: A car speeds up uniformly over 2 seconds.\n"
+        "1. The initial speed is 0 m/s.\n"
+        "2. The final speed is 20 m/s.\n"
+        "What is its acceleration?\n"
+        "A) 5 m/s^2\n"
+        "B) 10 m/s^2\n"
+        "C) 20 m/s^2\n"
+        "D) 40 m/s^2\n"
+        "Correct Answer: B) 10 m/s^2\n"
+        "Explanation: a = (20 - 0) / 2 = 10 m/s^2"
+    )
+    parsed = parse(text)
+    assert parsed['options'] == ['5 m/s^2', '10 m/s^2', '20 m/s^2', '40 m/s^2']
+    assert parsed['correct_answer'] == '10 m/s^2'
+
+def test_options_block_is_used_when_labelled():
+    """An explicit Options: block bounds the options, even with numbered explanation steps"""
+    text = (
+        "Question: Solve 2x + 3 = 7.\n\n"
+        "Options:\n"
+        "A) x = 1\n"
+        "B) x = 2\n"
+        "C) x = 3\n"
+        "D) x = 4\n\n"
+        "Correct Answer: B\n\n"
+        "Explanation:\n"
+        "1. Subtract 3 from both sides.\n"
+        "2. Divide by 2."
+    )
+    parsed = parse(text)
+    assert parsed['options'] == ['x = 1', 'x = 2', 'x = 3', 'x = 4']
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-v']))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test per-topic syllabus content caching in the evaluation quiz
+"""
+
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+pytest.importorskip('strands')
+pytest.importorskip('strands_tools')
+
+from services.utils import EvaluationQuiz
+from services.utils.EvaluationQuiz import EvaluationQuizAgent, _syllabus_cache_key
+
+class FakeRagAgent:
+    """RAG agent stand-in that answers each query with its own text"""
+    def __init__(self):
+        self.queries = []
+
+    async def invoke_async(self, query):
+        self.queries.append(query)
+        return SimpleNamespace(message=f"content for: {query}")
+
+def make_agent(cache):
+    """EvaluationQuizAgent with a fake RAG agent and without setting up real agents"""
+    agent = EvaluationQuizAgent.__new__(EvaluationQuizAgent)
+    agent._syllabus_cache = cache
+    agent._rag_agent_lock = asyncio.Lock()
+    agent.rag_agent = FakeRagAgent()
+    agent._create_rag_agent = lambda: agent.rag_agent
+    return agent
+
+@pytest.fixture(autouse=True)
+def cache_path(tmp_path, monkeypatch):
+    """Keep the on-disk syllabus cache out of the home directory"""
+    path = tmp_path / 'syllabus.json'
+    monkeypatch.setattr(EvaluationQuiz, '_SYLLABUS_CACHE_PATH', path)
+    return path
+
+def test_partially_warm_cache_fetches_only_missing_topics(cache_path):
+    """Cached topics are reused and each missing topic is fetched and cached under its own key"""
+    warm_key = _syllabus_cache_key('4048', 'Algebra: simplifying expressions')
+    agent = make_agent({warm_key: 'cached algebra content'})
+    requests = [
+        ('4048', 'Algebra: simplifying expressions', 'query simplifying'),
+        ('4048', 'Algebra: Solving linear/quadratic equations', 'query equations'),
+        ('6091', 'Kinematics', 'query kinematics'),
+    ]
+
+    results = asyncio.run(agent._gather_syllabus_content(requests))
+
+    assert sorted(agent.rag_agent.queries) == ['query equations', 'query kinematics']
+    assert results == [
+        'cached algebra content',
+        'content for: query equations',
+        'content for: query kinematics',
+    ]
+    assert agent._syllabus_cache[_syllabus_cache_key('4048', 'Algebra: Solving linear/quadratic equations')] == 'content for: query equations'
+    assert agent._syllabus_cache[_syllabus_cache_key('6091', 'Kinematics')] == 'content for: query kinematics'
+    assert json.loads(cache_path.read_text(encoding='utf-8')) == agent._syllabus_cache
+
+def test_fully_warm_cache_skips_rag_and_disk(cache_path):
+    """With every topic cached, nothing is queried or written"""
+    key = _syllabus_cache_key('6091', 'Kinematics')
+    agent = make_agent({key: 'cached kinematics content'})
+
+    results = asyncio.run(agent._gather_syllabus_content([('6091', 'Kinematics', 'query kinematics')]))
+
+    assert results == ['cached kinematics content']
+    assert agent.rag_agent.queries == []
+    assert not cache_path.exists()
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-v']))